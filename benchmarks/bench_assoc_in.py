@@ -0,0 +1,47 @@
+"""assoc_in compared with copy.deepcopy and set_in
+
+Run from the repository root: python3 -m benchmarks.bench_assoc_in
+"""
+import argparse
+import copy
+import timeit
+
+from benchmarks.documents import api_payload
+from flatql import assoc_in, set_in
+
+
+def make_paths(items, writes):
+    step = max(items // writes, 1)
+    return [f'items.#{i}.attributes.attr_0' for i in range(0, items, step)][:writes]
+
+
+def deepcopy_set_in(data, paths):
+    for path in paths:
+        data = set_in(copy.deepcopy(data), path, -1)
+    return data
+
+
+def repeated_assoc_in(data, paths):
+    for path in paths:
+        data = assoc_in(data, path, -1)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=2000)
+    parser.add_argument('--writes', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    data = api_payload(args.items)
+    paths = make_paths(args.items, args.writes)
+    assert deepcopy_set_in(data, paths) == repeated_assoc_in(data, paths)
+    for name, func in (('deepcopy + set_in', lambda: deepcopy_set_in(data, paths)),
+                       ('assoc_in', lambda: repeated_assoc_in(data, paths))):
+        elapsed = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f'{name:>18} {elapsed * 1000:>9.2f} ms {len(paths) / elapsed:>12.0f} writes/s')
+
+
+if __name__ == '__main__':
+    main()
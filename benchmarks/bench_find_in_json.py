@@ -0,0 +1,44 @@
+"""find_in_json compared with json.loads and find_in_paths
+
+Run from the repository root: python3 -m benchmarks.bench_find_in_json
+"""
+import argparse
+import json
+import mmap
+import tempfile
+import timeit
+
+from flatql import find_in_json, find_in_paths
+
+from benchmarks.documents import api_payload
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=4000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    document = api_payload(args.items, width=10)
+    # the same keys after the items, the whole document has to be scanned
+    document['trailer'] = dict(document['meta'])
+    data = json.dumps(document).encode()
+    cases = [['meta.id'], ['trailer.id'], ['items.#-1.sku'], ['items.*.qty']]
+    print(f'{len(data) / 2 ** 20:.1f} MiB')
+    with tempfile.TemporaryFile() as file:
+        file.write(data)
+        file.flush()
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        for paths in cases:
+            expected = find_in_paths(json.loads(data), paths)
+            assert find_in_json(mapped, paths) == expected
+            for name, func in (('json.loads', lambda: find_in_paths(json.loads(data), paths)),
+                               ('find_in_json', lambda: find_in_json(data, paths)),
+                               ('mmap', lambda: find_in_json(mapped, paths))):
+                elapsed = min(timeit.repeat(func, number=1, repeat=args.repeat))
+                print(f'{",".join(paths):>15} {name:>13} {elapsed * 1000:>9.2f} ms')
+        mapped.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""IncrementalTransform.update compared with a full transform after one changed field
+
+Run from the repository root: python3 -m benchmarks.bench_incremental
+"""
+import argparse
+import timeit
+
+from flatql import IncrementalTransform, compile_transform, set_in
+
+
+def make_document(fields):
+    return {'record': {f'field_{i}': i for i in range(fields)},
+            'items': [{'id': i, 'name': f'Item {i}'} for i in range(fields // 10)]}
+
+
+CONFIG = {'record.*': 'values.{1}',
+          'items.*.id': 'lines.{1}.id',
+          'items.*.name': 'lines.{1}.title'}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--fields', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    document = make_document(args.fields)
+    plan = compile_transform(CONFIG)
+    incremental = IncrementalTransform(CONFIG)
+    incremental(document)
+
+    def update():
+        set_in(document, 'items.#1.name', 'Changed')
+        return incremental.update(document, ['items.#1.name'])
+
+    assert update() == plan(document)
+    for name, func in (('transform', lambda: plan(document)), ('update', update)):
+        elapsed = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f'{name:>10} {elapsed * 1000:>9.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
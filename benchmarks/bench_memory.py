@@ -0,0 +1,60 @@
+"""Memory of find results and transform with string paths and compact Path objects
+
+Run from the repository root: python3 -m benchmarks.bench_memory
+"""
+import argparse
+import tracemalloc
+
+from flatql import compile_transform, find
+
+from benchmarks.documents import deep_narrow
+
+
+def nested_lists(lists=100, items=100):
+    return {'deep_list': [{'items': [{'item': {'id': i, 'name': 'Item'}} for i in range(items)]}
+                          for _ in range(lists)]}
+
+
+def measure(func):
+    """Runs func with tracemalloc
+
+    :return: (KiB still allocated by the result, peak KiB)
+    """
+    tracemalloc.start()
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 1024, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lists', type=int, default=100)
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--depth', type=int, default=50)
+    args = parser.parse_args()
+
+    nested = nested_lists(args.lists, args.items)
+    deep = deep_narrow(args.depth, args.lists * args.items)
+    deep_path = '.'.join(['level'] * args.depth + ['items', '*', 'name'])
+    string_plan = compile_transform({deep_path: None})
+    compact_plan = compile_transform({deep_path: None})
+    string_plan.compact = False
+    compact_plan.compact = True
+
+    cases = [('nested find', lambda: find(nested, 'deep_list.*.items.*.item.*')),
+             ('nested compact', lambda: find(nested, 'deep_list.*.items.*.item.*', compact=True)),
+             ('deep find', lambda: find(deep, deep_path)),
+             ('deep compact', lambda: find(deep, deep_path, compact=True)),
+             ('deep transform', lambda: string_plan(deep)),
+             ('deep transform compact', lambda: compact_plan(deep))]
+    print(f'{"case":<24} {"result KiB":>11} {"peak KiB":>10}')
+    for name, func in cases:
+        func()
+        current, peak = measure(func)
+        print(f'{name:<24} {current:>11.1f} {peak:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Scaling of transform_many with the number of worker processes
+
+Run from the repository root: python3 -m benchmarks.bench_parallel
+"""
+import argparse
+import os
+import time
+
+from flatql import transform_many
+
+from benchmarks.documents import api_payload
+
+CONFIG = {'meta.id': 'uuid',
+          'customer.name': 'client.name',
+          'items.*.sku': 'lines.{1}.product',
+          'items.*.qty': 'lines.{1}.quantity',
+          'items.*.price': 'lines.{1}.price',
+          'items.*.tags.*': 'lines.{1}.labels.{3}'}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--items', type=int, default=20)
+    parser.add_argument('--chunksize', type=int, default=256)
+    args = parser.parse_args()
+
+    docs = [api_payload(args.items, width=5, idx=idx) for idx in range(args.docs)]
+    workers = 1
+    baseline = None
+    print(f'{"workers":>8} {"seconds":>9} {"docs/s":>10} {"speedup":>8}')
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        for _ in transform_many(docs, CONFIG, workers=workers, chunksize=args.chunksize):
+            pass
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f'{workers:>8} {elapsed:>9.3f} {args.docs / elapsed:>10.0f} {baseline / elapsed:>8.2f}')
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
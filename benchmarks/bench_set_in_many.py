@@ -0,0 +1,38 @@
+"""set_in_many compared with repeated set_in calls
+
+Run from the repository root: python3 -m benchmarks.bench_set_in_many
+"""
+import argparse
+import timeit
+
+from flatql import set_in, set_in_many
+
+
+def make_values(items, fields):
+    return {f'order.items.#{i}.field_{k}': i * k for i in range(items) for k in range(fields)}
+
+
+def repeated_set_in(values):
+    data = {}
+    for path, value in values.items():
+        data = set_in(data, path, value)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=200)
+    parser.add_argument('--fields', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    values = make_values(args.items, args.fields)
+    assert repeated_set_in(values) == set_in_many({}, values)
+    for name, func in (('set_in', lambda: repeated_set_in(values)),
+                       ('set_in_many', lambda: set_in_many({}, values))):
+        elapsed = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f'{name:>12} {elapsed * 1000:>9.2f} ms {len(values) / elapsed:>12.0f} writes/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""Compiled templates compared with rewriting path strings one by one
+
+Run from the repository root: python3 -m benchmarks.bench_templates
+"""
+import argparse
+import timeit
+
+from flatql.paths import _rewrite_path, parse_template, rewrite_path
+
+TEMPLATE = 'orders.{1}.lines.{3}.product'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--paths', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    parts = [('items', f'#{i // 100}', 'lines', f'#{i % 100}', 'sku') for i in range(args.paths)]
+    paths = ['.'.join(path_parts) for path_parts in parts]
+    template = parse_template(TEMPLATE)
+    assert [rewrite_path(path, TEMPLATE) for path in paths] == [
+        _rewrite_path(path, TEMPLATE) for path in paths]
+    assert template.render_many(parts) == [path.split('.') for path in map(template, paths)]
+    cases = (('split and replace', lambda: [_rewrite_path(path, TEMPLATE) for path in paths]),
+             ('rewrite_path', lambda: [rewrite_path(path, TEMPLATE) for path in paths]),
+             ('render', lambda: [template.render(path_parts) for path_parts in parts]),
+             ('render_many', lambda: template.render_many(parts)))
+    for name, func in cases:
+        elapsed = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f'{name:>18} {elapsed * 1000:>9.2f} ms {args.paths / elapsed:>12.0f} paths/s')
+
+
+if __name__ == '__main__':
+    main()
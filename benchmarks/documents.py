@@ -0,0 +1,41 @@
+"""Generated documents used by benchmarks"""
+
+
+def shallow_wide(width=1000):
+    """Flat document with many keys
+
+    :param width: number of keys
+    :return: dict, example: {'key_0': {'id': 0, 'name': 'Name 0'}, ...}
+    """
+    return {f'key_{i}': {'id': i, 'name': f'Name {i}'} for i in range(width)}
+
+
+def deep_narrow(depth=50, items=10):
+    """Deeply nested document with a short list at the bottom
+
+    :param depth: number of nested levels
+    :param items: length of the list at the bottom
+    :return: dict, example: {'level': {'level': {'id': 0, 'items': [...]}}}
+    """
+    document = {'id': depth, 'items': [{'id': i, 'name': f'Item {i}'} for i in range(items)]}
+    for level in range(depth):
+        document = {'level': document, 'depth': level}
+    return document
+
+
+def api_payload(items=100, width=10, idx=0):
+    """Document shaped like a typical API response
+
+    :param items: number of list items
+    :param width: number of attributes of every item
+    :param idx: document number
+    :return: dict
+    """
+    return {'meta': {'id': idx, 'version': 1, 'source': 'benchmark'},
+            'customer': {'id': idx, 'name': f'Customer {idx}', 'email': f'c{idx}@example.com'},
+            'items': [{'sku': f'SKU-{i}',
+                       'qty': i,
+                       'price': i * 1.5,
+                       'tags': ['a', 'b', 'c'],
+                       'attributes': {f'attr_{k}': k for k in range(width)}}
+                      for i in range(items)]}
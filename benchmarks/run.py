@@ -0,0 +1,122 @@
+"""Benchmark runner with JSON baselines
+
+Run from the repository root:
+
+    python3 -m benchmarks.run --save baseline.json
+    python3 -m benchmarks.run --compare baseline.json --threshold 0.1
+
+With --compare the exit status is 1 when any case is slower or allocates
+more than the threshold allows.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.suite import make_cases
+
+
+def measure_speed(func, repeat, min_time):
+    """Returns the best number of calls per second"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return number / best
+
+
+def measure_memory(func):
+    """Returns peak traced memory of a single call in bytes"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(cases, repeat, min_time):
+    results = {}
+    for name, func in cases:
+        func()
+        results[name] = {'ops_per_sec': measure_speed(func, repeat, min_time),
+                         'peak_bytes': measure_memory(func)}
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Finds cases slower or allocating more than the baseline
+
+    :return: list of (name, metric, baseline value, current value)
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result['ops_per_sec'] < base['ops_per_sec'] * (1 - threshold):
+            regressions.append((name, 'ops_per_sec', base['ops_per_sec'], result['ops_per_sec']))
+        if result['peak_bytes'] > base['peak_bytes'] * (1 + threshold):
+            regressions.append((name, 'peak_bytes', base['peak_bytes'], result['peak_bytes']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run')
+    parser.add_argument('--width', type=int, default=1000)
+    parser.add_argument('--depth', type=int, default=50)
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.1)
+    parser.add_argument('-k', dest='filter', help='run only cases containing this text')
+    parser.add_argument('--save', help='save results as JSON baseline')
+    parser.add_argument('--compare', help='JSON baseline to compare with')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed relative regression, default: 0.1')
+    args = parser.parse_args(argv)
+
+    cases = make_cases(args.width, args.depth, args.items)
+    if args.filter:
+        cases = [(name, func) for name, func in cases if args.filter in name]
+    results = run(cases, args.repeat, args.min_time)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+    print(f'{"case":<24} {"ops/sec":>12} {"peak KiB":>10} {"change":>8}')
+    for name, result in results.items():
+        change = ''
+        if name in baseline:
+            change = f'{result["ops_per_sec"] / baseline[name]["ops_per_sec"] - 1:+.1%}'
+        print(f'{name:<24} {result["ops_per_sec"]:>12.0f} '
+              f'{result["peak_bytes"] / 1024:>10.1f} {change:>8}')
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'meta': {'python': platform.python_version(),
+                                'width': args.width, 'depth': args.depth, 'items': args.items},
+                       'results': results}, f, indent=2)
+    if args.compare:
+        regressions = compare(results, baseline, args.threshold)
+        for name, metric, before, after in regressions:
+            print(f'REGRESSION {name} {metric}: {before:.0f} -> {after:.0f}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
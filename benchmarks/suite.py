@@ -0,0 +1,52 @@
+"""Benchmark cases for flatql.tools"""
+from flatql import extract, find, find_in_paths, get_in, get_in_many, set_in, transform
+
+from benchmarks.documents import api_payload, deep_narrow, shallow_wide
+
+
+def make_cases(width=1000, depth=50, items=100):
+    """Creates benchmark cases
+
+    :param width: number of keys of shallow-wide document and item attributes
+    :param depth: number of levels of deep-narrow document
+    :param items: list length of deep-narrow and api documents
+    :return: list of (name, func)
+    """
+    shallow = shallow_wide(width)
+    deep = deep_narrow(depth, items)
+    api = api_payload(items, min(width, 20))
+
+    last_key = f'key_{width - 1}.name'
+    deep_prefix = '.'.join(['level'] * depth)
+    deep_path = f'{deep_prefix}.items.#-1.name'
+    api_paths = ['customer.id', 'items.*.sku', 'items.*.qty', 'items.*.price', 'items.*.tags.*']
+    api_config = {'meta.id': 'id',
+                  'customer.name': 'client.name',
+                  'items.*.sku': 'lines.{1}.product',
+                  'items.*.qty': 'lines.{1}.quantity',
+                  'items.*.price': 'lines.{1}.price',
+                  'items.*.tags.*': 'lines.{1}.labels.{3}'}
+
+    return [
+        ('shallow.get_in', lambda: get_in(shallow, last_key)),
+        ('shallow.set_in', lambda: set_in(shallow, last_key, 'Name')),
+        ('shallow.find', lambda: find(shallow, ['*', 'name'])),
+        ('shallow.find_in_paths', lambda: find_in_paths(shallow, ['*.id', '*.name'])),
+        ('shallow.transform', lambda: transform(shallow, {'*.name': 'names.{0}'})),
+        ('shallow.extract', lambda: extract(shallow, ['*.id'])),
+        ('deep.get_in', lambda: get_in(deep, deep_path)),
+        ('deep.set_in', lambda: set_in(deep, deep_path, 'Item')),
+        ('deep.find', lambda: find(deep, deep_path.replace('#-1', '*').split('.'))),
+        ('deep.find_in_paths', lambda: find_in_paths(deep, [f'{deep_prefix}.items.*.id',
+                                                            f'{deep_prefix}.items.*.name'])),
+        ('deep.transform', lambda: transform(deep, {f'{deep_prefix}.items.*.name': 'names.{%d}' % (depth + 1)})),
+        ('deep.extract', lambda: extract(deep, [f'{deep_prefix}.items.*.id'])),
+        ('api.get_in', lambda: get_in(api, 'items.#-1.attributes.attr_0')),
+        ('api.get_in_many', lambda: get_in_many(api, ['meta.id', 'customer.name', 'items.#0.sku',
+                                                      'items.#-1.attributes.attr_0'])),
+        ('api.set_in', lambda: set_in(api, 'items.#-1.attributes.attr_0', 0)),
+        ('api.find', lambda: find(api, ['items', '*', 'tags', '*'])),
+        ('api.find_in_paths', lambda: find_in_paths(api, api_paths)),
+        ('api.transform', lambda: transform(api, api_config)),
+        ('api.extract', lambda: extract(api, api_paths)),
+    ]
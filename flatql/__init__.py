@@ -1 +1,11 @@
-from flatql.tools import get_in, set_in, find, find_in_path, find_in_paths, transform, rewrite_path, extract
+from flatql.tools import get_in, get_in_many, set_in, assoc_in, set_in_many, update_in, find, iter_find, find_in_path, find_in_paths, transform, rewrite_path, extract
+from flatql.plan import compile_transform
+from flatql.stream import transform_stream
+from flatql.parallel import transform_many
+from flatql.query import query
+from flatql.collection import Collection
+from flatql.aio import atransform, atransform_stream
+from flatql.flat import flatten, unflatten, to_columns, from_columns
+from flatql.incremental import IncrementalTransform, diff_paths
+from flatql.jsonscan import find_in_json
+from flatql.paths import parse_template
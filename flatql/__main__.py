@@ -0,0 +1,45 @@
+import argparse
+import json
+import sys
+
+from flatql.stream import ERRORS, transform_stream, write_stream
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m flatql',
+                                     description='Transforms NDJSON documents based on config')
+    parser.add_argument('config', help='JSON file with transform config')
+    parser.add_argument('input', nargs='?', default='-', help='NDJSON input file, default: stdin')
+    parser.add_argument('-o', '--output', default='-', help='NDJSON output file, default: stdout')
+    parser.add_argument('--errors', choices=ERRORS, default='strict',
+                        help='what to do with records which can not be transformed')
+    args = parser.parse_args(argv)
+
+    with open(args.config) as config_file:
+        transform_config = json.load(config_file)
+    # rule functions can't be loaded from JSON, only destination paths and null
+    if not isinstance(transform_config, dict):
+        parser.error(f'{args.config}: config must be a JSON object')
+    for src, dst in transform_config.items():
+        if dst is not None and not isinstance(dst, str):
+            parser.error(f'{args.config}: destination of {src!r} must be a path string or null, '
+                         f'got {json.dumps(dst)}')
+    input_file = sys.stdin if args.input == '-' else open(args.input)
+    output_file = sys.stdout if args.output == '-' else open(args.output, 'w')
+    failures = []
+    try:
+        results = transform_stream(input_file, transform_config, errors=args.errors,
+                                   failures=failures)
+        write_stream(results, output_file)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+    for position, _, error in failures:
+        print(f'line {position}: {error!r}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import asyncio
+import inspect
+from collections import deque
+
+from flatql.builder import build_tree
+from flatql.engine import render_path
+from flatql.plan import TransformPlan, cached_plan
+from flatql.rules import FunctionRule, target_parts
+
+
+async def _apply(plan, input_data):
+    flat_data = []
+    pending = []
+    for rule, fields_found in zip(plan.rules, plan.find(input_data)):
+        if not isinstance(rule, FunctionRule):
+            rule.emit(fields_found, flat_data)
+            continue
+        for path_parts, value in fields_found:
+            result = rule.func(value, render_path(path_parts), *rule.args)
+            if inspect.isawaitable(result):
+                pending.append((len(flat_data), result))
+                flat_data.append(None)
+            else:
+                target_path, result = result
+                flat_data.append((target_parts(target_path), result))
+    if pending:
+        results = await asyncio.gather(*(awaitable for _, awaitable in pending))
+        for (position, _), (target_path, result) in zip(pending, results):
+            flat_data[position] = (target_parts(target_path), result)
+    return build_tree(flat_data)
+
+
+async def atransform(input_data, transform_config):
+    """Transforms input data to another shape, rule functions can be coroutines
+
+    All coroutine calls for the document run concurrently.
+
+    :param input_data: dict or list
+    :param transform_config: dict where the keys are source paths
+        and the values are destination paths
+    :return: dict or list
+    """
+    return await _apply(cached_plan(transform_config), input_data)
+
+
+async def _iterate(source):
+    if hasattr(source, '__aiter__'):
+        async for document in source:
+            yield document
+    else:
+        for document in source:
+            yield document
+
+
+async def atransform_stream(source, transform_config, concurrency=8):
+    """Transforms documents from async iterator, results keep the input order
+
+    At most concurrency documents are transformed at once, the next
+    document is read from source only when one of them is consumed.
+
+    :param source: async iterable or iterable of documents
+    :param transform_config: dict where the keys are source paths
+        and the values are destination paths
+    :param concurrency: max number of documents transformed at once
+    :return: async iterator of results
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency must be greater than 0')
+    plan = TransformPlan(transform_config)
+    pending = deque()
+    try:
+        async for document in _iterate(source):
+            pending.append(asyncio.ensure_future(_apply(plan, document)))
+            if len(pending) >= concurrency:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
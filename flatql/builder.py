@@ -0,0 +1,129 @@
+from flatql.paths import Path
+
+
+class ListBuilder:
+    """List under construction, items are kept in the order of creation"""
+    __slots__ = ('items', 'positions', 'ordered', 'last_index')
+
+    def __init__(self):
+        self.items = []
+        self.positions = {}
+        self.ordered = True
+        self.last_index = None
+
+    def add(self, part):
+        """Adds item for #N part
+
+        :param part: string, example: #1
+        :return: position of the new item or None for invalid part
+        """
+        if not (part.__class__ is str and part.startswith('#')):
+            return None
+        try:
+            index = int(part[1:])
+        except ValueError:
+            return None
+        if self.last_index is not None and index < self.last_index:
+            self.ordered = False
+        else:
+            self.last_index = index
+        position = self.positions[part] = len(self.items)
+        self.items.append(None)
+        return position
+
+    def build(self):
+        if not self.ordered:
+            positions = sorted((int(part[1:]), position) for part, position in self.positions.items())
+            self.items[:] = [self.items[position] for _, position in positions]
+        return self.items
+
+
+def _new_container(part, builders, parent, key):
+    if part.__class__ is str and part.startswith('#'):
+        builder = ListBuilder()
+        builders.append((builder, parent, key))
+        return builder
+    return {}
+
+
+def build_tree(flat_data):
+    """Builds result from the list of (path parts, value)
+
+    Parts starting with # create lists, list items are ordered by index,
+    missing indexes are skipped. Containers created for Path prefixes are
+    remembered, so paths sharing a prefix don't walk it again.
+
+    :param flat_data: list, example: [(('a', '#0'), 1)], parts can be Path
+    :return: dict or list, example: {'a': [1]}, None for empty flat_data
+    """
+    result = None
+    builders = []
+    # id of Path -> (Path, container), the Path is kept so its id is not reused
+    prefixes = {}
+    for path_parts, value in flat_data:
+        chain = None
+        current_level = None
+        if path_parts.__class__ is Path:
+            # only the parts below the closest remembered prefix are walked
+            chain = [path_parts]
+            node = path_parts.parent
+            while node is not None:
+                cached = prefixes.get(id(node))
+                if cached is not None:
+                    current_level = cached[1]
+                    break
+                chain.append(node)
+                node = node.parent
+            chain.reverse()
+            path_parts = tuple([node.part for node in chain])
+        if current_level is None:
+            if result is None:
+                result = _new_container(path_parts[0], builders, None, None)
+            current_level = result
+        last = len(path_parts) - 1
+        idx = 0
+        while True:
+            part = path_parts[idx]
+            if isinstance(current_level, dict):
+                if idx == last:
+                    if prefixes and part in current_level:
+                        # the value may replace a remembered container
+                        prefixes.clear()
+                    current_level[part] = value
+                    break
+                child = current_level.get(part)
+                if child is None:
+                    child = current_level[part] = _new_container(
+                        path_parts[idx + 1], builders, current_level, part)
+            elif current_level.__class__ is ListBuilder:
+                position = current_level.positions.get(part)
+                if position is None:
+                    position = current_level.add(part)
+                    if position is None:
+                        break
+                items = current_level.items
+                if idx == last:
+                    if prefixes and items[position] is not None:
+                        prefixes.clear()
+                    items[position] = value
+                    break
+                child = items[position]
+                if child is None:
+                    child = items[position] = _new_container(
+                        path_parts[idx + 1], builders, current_level, position)
+            else:
+                raise TypeError(f'can not set {part} in {type(current_level).__name__}')
+            current_level = child
+            if chain is not None:
+                prefixes[id(chain[idx])] = (chain[idx], child)
+            idx += 1
+    # nested lists are created after their parents, so they are finished first
+    for builder, parent, key in reversed(builders):
+        if parent is None:
+            result = builder.build()
+        elif parent.__class__ is ListBuilder:
+            if parent.items[key] is builder:
+                parent.items[key] = builder.build()
+        elif parent.get(key) is builder:
+            parent[key] = builder.build()
+    return result
@@ -0,0 +1,178 @@
+from functools import lru_cache
+
+from flatql.builder import build_tree
+from flatql.engine import iter_matches, list_items, render_path
+from flatql.paths import INDEX, WILDCARD, compile_template, parse_path, rewrite_path
+from flatql.rules import apply_instrumented, compile_rule, target_parts
+
+# CPython allows at most 20 statically nested loops
+MAX_WILDCARDS = 16
+
+
+def _match_lines(path, leaf, indent=1):
+    """Generates code walking path and running leaf code for every match
+
+    Variable v{N} holds the value at level N and p{N} its path part.
+
+    :param path: parsed path
+    :param leaf: function returning leaf code lines, called with
+        (list of part expressions, parts tuple expression, value variable)
+    :return: list of code lines
+    """
+    lines = []
+    parts = []
+    skip = 'return'
+    for level, segment in enumerate(path):
+        pad = '    ' * indent
+        value = f'v{level}'
+        child = f'v{level + 1}'
+        part = f'p{level + 1}'
+        if segment.kind is WILDCARD:
+            lines += [f'{pad}if isinstance({value}, dict):',
+                      f'{pad}    it{level + 1} = {value}.items()',
+                      f'{pad}elif isinstance({value}, list):',
+                      f'{pad}    it{level + 1} = _list_items({value})',
+                      f'{pad}else:',
+                      f'{pad}    {skip}',
+                      f'{pad}for {part}, {child} in it{level + 1}:']
+            indent += 1
+            skip = 'continue'
+            parts.append(part)
+        elif segment.kind is INDEX:
+            lines += [f'{pad}if isinstance({value}, dict):',
+                      f'{pad}    {part} = {segment.key!r}',
+                      f'{pad}    {child} = {value}.get({segment.key!r})',
+                      f'{pad}elif isinstance({value}, list) and '
+                      f'-len({value}) <= {segment.index} < len({value}):',
+                      f'{pad}    {part} = {segment.name!r}',
+                      f'{pad}    {child} = {value}[{segment.index}]',
+                      f'{pad}else:',
+                      f'{pad}    {skip}']
+            parts.append(part)
+        else:
+            lines += [f'{pad}if not isinstance({value}, dict):',
+                      f'{pad}    {skip}',
+                      f'{pad}{child} = {value}.get({segment.key!r})']
+            parts.append(repr(segment.key))
+    pad = '    ' * indent
+    parts_expr = f'({", ".join(parts)},)' if parts else '()'
+    lines += [pad + line for line in leaf(parts, parts_expr, f'v{len(path)}')]
+    return lines
+
+
+def _compile(source, name, namespace):
+    namespace = dict(namespace, _list_items=list_items, _render=render_path,
+                     _rewrite=rewrite_path, _target_parts=target_parts)
+    exec(compile(source, f'<flatql.codegen {name}>', 'exec'), namespace)
+    return namespace[name]
+
+
+def _can_generate(path):
+    return sum(1 for segment in path if segment.kind is WILDCARD) <= MAX_WILDCARDS
+
+
+class GeneratedFind:
+    """Path compiled to a Python function
+
+    :param path: the path, example: items.*.name
+    """
+
+    def __init__(self, path):
+        self.path = parse_path(path)
+        if _can_generate(self.path):
+            lines = ['def _find(v0, _append):']
+            lines += _match_lines(self.path, lambda parts, parts_expr, value:
+                                  [f'_append(({parts_expr}, {value}))'])
+            self.source = '\n'.join(lines) + '\n'
+            self._find = _compile(self.source, '_find', {})
+        else:
+            self.source = None
+            self._find = None
+
+    def matches(self, input_data):
+        """Finds all elements based on path
+
+        :param input_data: dict or list
+        :return: list of (path parts, value), the same as engine.iter_matches
+        """
+        if self._find is None:
+            return list(iter_matches(input_data, self.path))
+        result = []
+        self._find(input_data, result.append)
+        return result
+
+    def __call__(self, input_data):
+        """Finds all elements based on path
+
+        :param input_data: dict or list
+        :return: list elements of shape (path, value), the same as find
+        """
+        if not self.path:
+            return [(None, input_data)]
+        return [(render_path(parts), value) for parts, value in self.matches(input_data)]
+
+
+compile_find = lru_cache(maxsize=256)(GeneratedFind)
+
+
+def _rule_leaf(rule_id, dst, length):
+    if dst is None:
+        return lambda parts, parts_expr, value: [f'_append(({parts_expr}, {value}))']
+    if isinstance(dst, str):
+        template = compile_template(dst, length)
+        if template is None:
+            return lambda parts, parts_expr, value: [
+                f'_append((_rewrite(_render({parts_expr}), {dst!r}).split("."), {value}))']
+
+        def leaf(parts, parts_expr, value):
+            target = [parts[t] if t.__class__ is int else repr(t) for t in template]
+            return [f'_append((({", ".join(target)},), {value}))']
+        return leaf
+    return lambda parts, parts_expr, value: [
+        f'target_path, result = _func{rule_id}({value}, _render({parts_expr}), *_args{rule_id})',
+        '_append((_target_parts(target_path), result))']
+
+
+class GeneratedTransform:
+    """Transform config compiled to Python functions, one function per rule
+
+    :param transform_config: dict where the keys are source paths
+        and the values are destination paths
+    """
+
+    def __init__(self, transform_config):
+        self.transform_config = transform_config
+        namespace = {}
+        lines = []
+        calls = []
+        for rule_id, (src, dst) in enumerate(transform_config.items()):
+            path = parse_path(src)
+            if not _can_generate(path):
+                raise ValueError(f'{src} has too many wildcards for code generation')
+            if not (dst is None or isinstance(dst, str)):
+                namespace[f'_func{rule_id}'] = dst[0]
+                namespace[f'_args{rule_id}'] = tuple(dst[1:])
+            lines.append(f'def _rule{rule_id}(v0, _append):')
+            lines += _match_lines(path, _rule_leaf(rule_id, dst, len(path)))
+            lines.append('')
+            calls.append(f'    _rule{rule_id}(v0, _append)')
+        lines.append('def _transform(v0, _append):')
+        lines += calls or ['    pass']
+        self.source = '\n'.join(lines) + '\n'
+        self._transform = _compile(self.source, '_transform', namespace)
+
+    def apply(self, input_data, hook=None):
+        """Transforms input data to another shape
+
+        :param input_data: dict or list
+        :param hook: flatql.profiling.Hook, instrumented runs don't use generated code
+        :return: dict or list, the same as transform(input_data, transform_config)
+        """
+        if hook is not None:
+            rules = [compile_rule(src, dst) for src, dst in self.transform_config.items()]
+            return apply_instrumented(input_data, list(self.transform_config), rules, hook)
+        flat_data = []
+        self._transform(input_data, flat_data.append)
+        return build_tree(flat_data)
+
+    __call__ = apply
@@ -0,0 +1,223 @@
+from flatql.engine import iter_values, resolve
+from flatql.paths import parse_path, paths_overlap
+from flatql.tools import set_in, set_in_many, update_in
+
+
+def _changed_path(document, path):
+    """Returns the part of the path below which writing to it can change the document
+
+    set_in replaces falsy containers on the path with new ones, so paths
+    going through them can match different elements after the write.
+
+    :param document: dict or list before the write
+    :param path: the path of the write, example: customer.name
+    :return: tuple of Segment, example: (Segment(key, 'customer'),)
+    """
+    segments = parse_path(path)
+    value = document
+    for level, segment in enumerate(segments):
+        if not value or not segment.key:
+            return segments[:level]
+        value = resolve(value, ((segment.key, segment.index),))
+    return segments
+
+
+class PathIndex:
+    """Hash index of values found at the path
+
+    :param path: the path, example: tags.*
+    """
+    __slots__ = ('path', 'segments', 'values', 'unhashable', 'keys')
+
+    def __init__(self, path):
+        self.path = path
+        self.segments = parse_path(path)
+        self.values = {}
+        self.unhashable = {}
+        self.keys = {}
+
+    def add(self, doc_id, document):
+        keys = []
+        for value in iter_values(document, self.segments):
+            try:
+                self.values.setdefault(value, {})[doc_id] = None
+            except TypeError:
+                self.unhashable[doc_id] = None
+            else:
+                keys.append(value)
+        self.keys[doc_id] = keys
+
+    def remove(self, doc_id):
+        for value in self.keys.pop(doc_id, ()):
+            doc_ids = self.values.get(value)
+            if doc_ids is not None:
+                doc_ids.pop(doc_id, None)
+                if not doc_ids:
+                    del self.values[value]
+        self.unhashable.pop(doc_id, None)
+
+
+class Collection:
+    """List of documents with hash indexes on paths
+
+    Documents get ids in order they were added, initial documents get
+    their positions. Indexes are updated by the collection methods, after
+    changing a document directly call reindex.
+
+    :param documents: iterable of documents
+    :param indexes: iterable of paths to index, example: ['customer.id', 'tags.*']
+    """
+
+    def __init__(self, documents=(), indexes=()):
+        self.documents = {}
+        self.indexes = {}
+        self._next_id = 0
+        for document in documents:
+            self.add(document)
+        for path in indexes:
+            self.create_index(path)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def __iter__(self):
+        return iter(self.documents.values())
+
+    def get(self, doc_id, default=None):
+        """Returns the document with doc_id"""
+        return self.documents.get(doc_id, default)
+
+    def create_index(self, path):
+        """Creates the index on the path
+
+        :param path: the path, wildcards are allowed, example: tags.*
+        """
+        if path in self.indexes:
+            return
+        index = self.indexes[path] = PathIndex(path)
+        for doc_id, document in self.documents.items():
+            index.add(doc_id, document)
+
+    def drop_index(self, path):
+        """Removes the index on the path"""
+        del self.indexes[path]
+
+    def add(self, document):
+        """Adds the document
+
+        :param document: dict or list
+        :return: id of the document
+        """
+        doc_id = self._next_id
+        self._next_id += 1
+        self.documents[doc_id] = document
+        for index in self.indexes.values():
+            index.add(doc_id, document)
+        return doc_id
+
+    def remove(self, doc_id):
+        """Removes the document
+
+        :param doc_id: id of the document
+        :return: removed document
+        """
+        document = self.documents.pop(doc_id)
+        for index in self.indexes.values():
+            index.remove(doc_id)
+        return document
+
+    def reindex(self, doc_id=None, paths=None):
+        """Updates indexes after documents were changed directly
+
+        :param doc_id: id of changed document, default: all documents
+        :param paths: changed paths, default: the whole document
+        """
+        doc_ids = list(self.documents) if doc_id is None else [doc_id]
+        for index in self.indexes.values():
+            if paths is not None and not any(paths_overlap(index.segments, path) for path in paths):
+                continue
+            for changed_id in doc_ids:
+                index.remove(changed_id)
+                index.add(changed_id, self.documents[changed_id])
+
+    def set_in(self, doc_id, path, value):
+        """Set the value at the path in the document, see flatql.set_in
+
+        :return: modified document
+        """
+        changed = [_changed_path(self.documents[doc_id], path)]
+        try:
+            document = self.documents[doc_id] = set_in(self.documents[doc_id], path, value)
+        finally:
+            self.reindex(doc_id, changed)
+        return document
+
+    def set_in_many(self, doc_id, values):
+        """Set values at the paths in the document, see flatql.set_in_many
+
+        Falsy list items are replaced, set_in inserts before them.
+
+        :return: modified document
+        """
+        changed = [_changed_path(self.documents[doc_id], path) for path in values]
+        try:
+            # the document can be changed before an invalid path raises
+            document = self.documents[doc_id] = set_in_many(self.documents[doc_id], values)
+        finally:
+            self.reindex(doc_id, changed)
+        return document
+
+    def update_in(self, doc_id, path, func, *args):
+        """Update the value at the path in the document, see flatql.update_in
+
+        :return: modified document
+        """
+        changed = [_changed_path(self.documents[doc_id], path)]
+        try:
+            document = self.documents[doc_id] = update_in(self.documents[doc_id], path, func, *args)
+        finally:
+            self.reindex(doc_id, changed)
+        return document
+
+    def lookup(self, path, value):
+        """Finds documents with the value at the path
+
+        None also matches documents where only the last key of the path is missing.
+
+        :param path: the path, example: customer.id
+        :param value: value to find
+        :return: list of documents
+        """
+        index = self.indexes.get(path)
+        if index is not None:
+            try:
+                doc_ids = index.values.get(value, ())
+            except TypeError:
+                pass
+            else:
+                return [self.documents[doc_id] for doc_id in sorted(doc_ids)]
+        return self.filter(path, lambda found: found == value)
+
+    def filter(self, path, predicate):
+        """Finds documents with any value at the path matching predicate
+
+        With the index the predicate is called once for every distinct value.
+
+        :param path: the path, example: tags.*
+        :param predicate: function called with the found value
+        :return: list of documents
+        """
+        index = self.indexes.get(path)
+        if index is None:
+            segments = parse_path(path)
+            return [document for document in self.documents.values()
+                    if any(predicate(value) for value in iter_values(document, segments))]
+        doc_ids = set()
+        for value, value_doc_ids in index.values.items():
+            if predicate(value):
+                doc_ids.update(value_doc_ids)
+        for doc_id in index.unhashable:
+            if doc_id not in doc_ids and any(predicate(value) for value in
+                                             iter_values(self.documents[doc_id], index.segments)):
+                doc_ids.add(doc_id)
+        return [self.documents[doc_id] for doc_id in sorted(doc_ids)]
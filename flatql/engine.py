@@ -0,0 +1,338 @@
+from flatql.paths import INDEX, WILDCARD, Path
+
+_EMPTY = iter(())
+_INDEX_NAMES = []
+_INDEX_NAMES_LIMIT = 65536
+
+
+def list_items(input_data):
+    """Iterates over list items with their path parts
+
+    :param input_data: list
+    :return: iterator of (path part, item), example: ('#0', 'item 1')
+    """
+    length = len(input_data)
+    if length > len(_INDEX_NAMES):
+        if length > _INDEX_NAMES_LIMIT:
+            return ((f'#{idx}', item) for idx, item in enumerate(input_data))
+        _INDEX_NAMES.extend(f'#{idx}' for idx in range(len(_INDEX_NAMES), length))
+    return zip(_INDEX_NAMES, input_data)
+
+
+def children(input_data, segment):
+    """Finds children of input_data matching single path segment
+
+    :param input_data: dict or list
+    :param segment: parsed path segment
+    :return: iterator of (path part, value)
+    """
+    if isinstance(input_data, dict):
+        if segment.kind is WILDCARD:
+            return iter(input_data.items())
+        key = segment.key
+        return iter(((key, input_data.get(key)),))
+    if isinstance(input_data, list):
+        kind = segment.kind
+        if kind is WILDCARD:
+            return list_items(input_data)
+        if kind is INDEX:
+            idx = segment.index
+            if -len(input_data) <= idx < len(input_data):
+                return iter(((segment.name, input_data[idx]),))
+    return _EMPTY
+
+
+def counting_children(counter):
+    """Creates children function which counts visited nodes
+
+    :param counter: list, the number of nodes is added to counter[0]
+    :return: function with the same arguments as children
+    """
+    def counted(input_data, segment):
+        for item in children(input_data, segment):
+            counter[0] += 1
+            yield item
+    return counted
+
+
+def resolve(input_data, lookups, default=None):
+    """Finds the value of a path without wildcards with direct lookups
+
+    The same as the first value of iter_values, a missing last key gives None.
+
+    :param input_data: dict or list
+    :param lookups: precomputed path, see flatql.paths.literal_path
+    :param default: value returned if nothing was found
+    :return: value
+    """
+    value = input_data
+    for key, index in lookups:
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif index is not None and isinstance(value, list):
+            try:
+                value = value[index]
+            except IndexError:
+                return default
+        else:
+            return default
+    return value
+
+
+def iter_matches(input_data, path, children=children):
+    """Iterates over all elements matching path without recursion
+
+    :param input_data: dict or list
+    :param path: parsed path, see flatql.paths.parse_path
+    :param children: function finding children of a node, see counting_children
+    :return: iterator of (path parts, value), example: (('b', '#0', 'name'), 'x')
+    """
+    depth = len(path)
+    if not depth:
+        yield (), input_data
+        return
+    last = depth - 1
+    parts = [None] * depth
+    stack = [children(input_data, path[0])]
+    while stack:
+        level = len(stack) - 1
+        if level == last:
+            for key, value in stack.pop():
+                parts[level] = key
+                yield tuple(parts), value
+            continue
+        for key, value in stack[-1]:
+            parts[level] = key
+            stack.append(children(value, path[level + 1]))
+            break
+        else:
+            stack.pop()
+
+
+def iter_values(input_data, path, children=children):
+    """Iterates over values of all elements matching path
+
+    :param input_data: dict or list
+    :param path: parsed path, see flatql.paths.parse_path
+    :param children: function finding children of a node, see counting_children
+    :return: iterator of values
+    """
+    depth = len(path)
+    if not depth:
+        yield input_data
+        return
+    last = depth - 1
+    stack = [children(input_data, path[0])]
+    while stack:
+        level = len(stack) - 1
+        if level == last:
+            for _, value in stack.pop():
+                yield value
+            continue
+        for _, value in stack[-1]:
+            stack.append(children(value, path[level + 1]))
+            break
+        else:
+            stack.pop()
+
+
+def iter_path_matches(input_data, path, children=children, parent=None):
+    """Iterates over all elements matching path, the same as iter_matches
+    but matches found under the same element share their Path prefix
+
+    :param input_data: dict or list
+    :param path: parsed path, see flatql.paths.parse_path
+    :param children: function finding children of a node, see counting_children
+    :param parent: Path prefix of all matches, default=None
+    :return: iterator of (Path, value)
+    """
+    depth = len(path)
+    if not depth:
+        yield parent, input_data
+        return
+    last = depth - 1
+    prefixes = [parent] * depth
+    stack = [children(input_data, path[0])]
+    while stack:
+        level = len(stack) - 1
+        if level == last:
+            prefix = prefixes[level]
+            for key, value in stack.pop():
+                yield Path(prefix, key), value
+            continue
+        for key, value in stack[-1]:
+            prefixes[level + 1] = Path(prefixes[level], key)
+            stack.append(children(value, path[level + 1]))
+            break
+        else:
+            stack.pop()
+
+
+def iter_rendered_matches(input_data, path, current_path=None, children=children):
+    """Iterates over all elements matching path, the same as iter_matches
+    but with path strings, prefixes are rendered once for all matches under them
+
+    :param input_data: dict or list
+    :param path: parsed path, see flatql.paths.parse_path
+    :param current_path: prefix path string, default=None
+    :param children: function finding children of a node, see counting_children
+    :return: iterator of (path string, value), example: ('b.#0.name', 'x')
+    """
+    depth = len(path)
+    if not depth:
+        yield current_path, input_data
+        return
+    last = depth - 1
+    prefix = current_path or None
+    first = 0
+    # segments before the first wildcard match at most one element
+    while first < last and path[first].kind is not WILDCARD:
+        for key, input_data in children(input_data, path[first]):
+            prefix = f'{key}' if prefix is None else f'{prefix}.{key}'
+            break
+        else:
+            return
+        first += 1
+    prefixes = [prefix] * (depth + 1)
+    stack = [children(input_data, path[first])]
+    while stack:
+        level = len(stack) + first - 1
+        prefix = prefixes[level]
+        if level == last:
+            if prefix is None:
+                for key, value in stack.pop():
+                    yield f'{key}', value
+            else:
+                for key, value in stack.pop():
+                    yield f'{prefix}.{key}', value
+            continue
+        for key, value in stack[-1]:
+            prefixes[level + 1] = f'{key}' if prefix is None else f'{prefix}.{key}'
+            stack.append(children(value, path[level + 1]))
+            break
+        else:
+            stack.pop()
+
+
+def render_path(parts, current_path=None):
+    """Joins path parts into the path string
+
+    :param parts: tuple, example: ('b', '#0', 'name')
+    :param current_path: prefix path, default=None
+    :return: string, example: b.#0.name
+    """
+    try:
+        path = '.'.join(parts)
+    except TypeError:
+        path = '.'.join(map(str, parts))
+    return f'{current_path}.{path}' if current_path else path
+
+
+class TrieNode:
+    """Node of the PathTrie"""
+    __slots__ = ('edges', 'nodes', 'terminals', 'keys_only')
+
+    def __init__(self):
+        self.edges = []
+        self.nodes = {}
+        self.terminals = []
+        self.keys_only = True
+
+    def child(self, segment):
+        node = self.nodes.get(segment.key)
+        if node is None:
+            node = self.nodes[segment.key] = TrieNode()
+            self.edges.append((segment, node))
+            if segment.kind is WILDCARD:
+                self.keys_only = False
+        return node
+
+
+def _node_children(node, input_data):
+    if isinstance(input_data, dict) and node.keys_only:
+        return iter([(child, key, input_data.get(key)) for key, child in node.nodes.items()])
+    return iter([(child, key, value)
+                 for segment, child in node.edges
+                 for key, value in children(input_data, segment)])
+
+
+class PathTrie:
+    """Parsed paths merged by shared prefixes
+
+    Every document node is visited once, matches are shared by all paths
+    going through it.
+
+    :param paths: list of parsed paths, see flatql.paths.parse_path
+    """
+
+    def __init__(self, paths):
+        self.root = TrieNode()
+        self.size = len(paths)
+        self.depth = 0
+        for path_id, path in enumerate(paths):
+            node = self.root
+            for segment in path:
+                node = node.child(segment)
+            node.terminals.append(path_id)
+            self.depth = max(self.depth, len(path))
+
+    def find(self, input_data, compact=False):
+        """Finds elements for all paths
+
+        :param input_data: dict or list
+        :param compact: matches have Path sharing prefixes instead of tuples of parts
+        :return: list with list of (path parts, value) for every path
+        """
+        return self._walk(input_data, True, compact)
+
+    def values(self, input_data):
+        """Finds values for all paths
+
+        :param input_data: dict or list
+        :return: list with list of values for every path
+        """
+        return self._walk(input_data, False, False)
+
+    def node_values(self, node, input_data, results):
+        """Finds values for paths going through node
+
+        :param node: TrieNode of this trie
+        :param input_data: value matched by the node
+        :param results: list with list of values for every path, found values are appended
+        """
+        self._walk(input_data, False, False, node, results)
+
+    def _walk(self, input_data, with_paths, compact, root=None, results=None):
+        if results is None:
+            results = [[] for _ in range(self.size)]
+        if root is None:
+            root = self.root
+        for path_id in root.terminals:
+            results[path_id].append(((), input_data) if with_paths else input_data)
+        if not root.edges:
+            return results
+        parts = [None] * self.depth
+        prefixes = [None] * (self.depth + 1)
+        stack = [_node_children(root, input_data)]
+        while stack:
+            level = len(stack) - 1
+            for node, key, value in stack[-1]:
+                if compact:
+                    match_path = prefixes[level + 1] = Path(prefixes[level], key)
+                else:
+                    parts[level] = key
+                if node.terminals:
+                    if not with_paths:
+                        match = value
+                    elif compact:
+                        match = (match_path, value)
+                    else:
+                        match = (tuple(parts[:level + 1]), value)
+                    for path_id in node.terminals:
+                        results[path_id].append(match)
+                if node.edges:
+                    stack.append(_node_children(node, value))
+                    break
+            else:
+                stack.pop()
+        return results
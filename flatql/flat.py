@@ -0,0 +1,125 @@
+from array import array
+
+from flatql.builder import build_tree
+from flatql.engine import list_items
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NUMERIC = ('array', 'numpy', None)
+
+
+def _items(input_data):
+    if isinstance(input_data, dict):
+        return iter(input_data.items())
+    return list_items(input_data)
+
+
+def flatten(input_data):
+    """Converts input data to the list of leaf paths and values
+
+    Leaves are values other than dict and list, and empty dicts and lists.
+    Keys are converted to strings and joined with dots, so keys like 'a.b'
+    or 1 and '1' can give the same path twice.
+
+    :param input_data: dict or list
+    :return: list of (path, value), example: [('items.#0.name', 'Item 1')],
+        empty for an empty dict or list and for other values
+    """
+    result = []
+    if not isinstance(input_data, (dict, list)) or not input_data:
+        return result
+    stack = [(None, _items(input_data))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            if key.__class__ is not str:
+                key = str(key)
+            path = f'{prefix}.{key}' if prefix is not None else key
+            if isinstance(value, (dict, list)) and value:
+                stack.append((path, _items(value)))
+                break
+            result.append((path, value))
+        else:
+            stack.pop()
+    return result
+
+
+def unflatten(pairs):
+    """Converts the list of paths and values back to the document
+
+    The same as input of flatten, unless it had keys with dots or was
+    an empty dict or list (None is returned).
+
+    :param pairs: iterable of (path, value), example: [('items.#0.name', 'Item 1')]
+    :return: dict or list, None for empty pairs
+    """
+    return build_tree([(path.split('.'), value) for path, value in pairs])
+
+
+def _compact(values, numeric):
+    if numeric is None or not values:
+        return values
+    kinds = {value.__class__ for value in values}
+    if kinds == {int}:
+        typecode, dtype = 'q', 'int64'
+    elif kinds <= {int, float}:
+        typecode, dtype = 'd', 'float64'
+    else:
+        return values
+    try:
+        if numeric == 'numpy':
+            return numpy.array(values, dtype=dtype)
+        return array(typecode, values)
+    except OverflowError:
+        return values
+
+
+def to_columns(documents, numeric='array'):
+    """Converts documents to columns of leaf values
+
+    Missing values are None. Columns with only int or float values
+    are stored as array.array or numpy arrays. ValueError is raised when
+    a document has the same path twice, see flatten.
+
+    :param documents: iterable of dicts or lists
+    :param numeric: array - use array.array for numeric columns,
+        numpy - use numpy arrays, None - keep lists
+    :return: dict where the keys are paths and the values are columns
+    """
+    if numeric not in NUMERIC:
+        raise ValueError(f'numeric must be one of {NUMERIC}')
+    if numeric == 'numpy' and numpy is None:
+        raise ImportError('numpy is required for numeric=numpy')
+    columns = {}
+    count = 0
+    for document in documents:
+        for path, value in flatten(document):
+            column = columns.get(path)
+            if column is None:
+                column = columns[path] = [None] * count
+            elif len(column) > count:
+                raise ValueError(f'path {path} found twice in document {count}')
+            column.append(value)
+        count += 1
+        for column in columns.values():
+            if len(column) < count:
+                column.append(None)
+    return {path: _compact(column, numeric) for path, column in columns.items()}
+
+
+def from_columns(columns):
+    """Converts columns back to documents, None values are skipped
+
+    :param columns: dict where the keys are paths and the values are columns
+    :return: list of documents
+    """
+    columns = [(path.split('.'), column) for path, column in columns.items()]
+    count = max((len(column) for _, column in columns), default=0)
+    documents = []
+    for idx in range(count):
+        documents.append(build_tree([(parts, column[idx]) for parts, column in columns
+                                     if idx < len(column) and column[idx] is not None]))
+    return documents
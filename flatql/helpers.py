@@ -4,6 +4,8 @@ def simple_rewrite(source_path, target_path, item):
 def convert_pseudo_list(input_data):
     """Converts input data with pseudo lists to normal lists
 
+    Kept for backwards compatibility, transform builds lists directly.
+
     :param input_data: dict, example: {'test': {'#0': 'item 1' ,'#1': 'item 2'}}
     :return: dict or list, example: {'test': ['item 1', 'item 2']}
     """
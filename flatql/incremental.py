@@ -0,0 +1,180 @@
+from flatql.builder import build_tree
+from flatql.engine import iter_matches, list_items
+from flatql.paths import parse_path, paths_overlap
+from flatql.plan import TransformPlan
+
+
+def diff_paths(old, new):
+    """Finds paths of values which differ between two documents
+
+    :param old: dict or list
+    :param new: dict or list
+    :return: list of paths, example: ['items.#1.name'], changed lists of
+        different length are reported as one path, ['*'] when the whole document changed
+    """
+    if (old.__class__ is not new.__class__ or not isinstance(old, (dict, list))
+            or isinstance(old, list) and len(old) != len(new)):
+        # lists of different length are reported as a whole, like nested ones
+        return [] if old == new else ['*']
+    result = []
+    stack = [(None, old, new)]
+    while stack:
+        prefix, old, new = stack.pop()
+        if isinstance(old, dict):
+            keys = list(old)
+            keys.extend(key for key in new if key not in old)
+            pairs = ((key, old.get(key), new.get(key), key in old and key in new) for key in keys)
+        else:
+            pairs = ((key, old_value, new_value, True)
+                     for (key, old_value), new_value in zip(list_items(old), new))
+        for key, old_value, new_value, in_both in pairs:
+            path = f'{prefix}.{key}' if prefix is not None else str(key)
+            if not in_both:
+                result.append(path)
+            elif old_value is new_value:
+                continue
+            elif (old_value.__class__ is new_value.__class__ and isinstance(old_value, (dict, list))
+                  and (isinstance(old_value, dict) or len(old_value) == len(new_value))):
+                stack.append((path, old_value, new_value))
+            elif old_value != new_value:
+                result.append(path)
+    return result
+
+
+def _list_prefixes(target):
+    return [target[:idx] for idx, part in enumerate(target)
+            if part.__class__ is str and part.startswith('#')]
+
+
+class IncrementalTransform:
+    """Transform which keeps intermediate results of every rule, so after
+    small changes of the input only affected rules are applied again
+
+    Use one instance per document, the last result is patched in place
+    when possible.
+
+    :param transform_config: dict where the keys are source paths
+        and the values are destination paths
+    """
+
+    def __init__(self, transform_config):
+        self.plan = TransformPlan(transform_config)
+        self.plan.compact = False
+        self.flat_data = None
+        self.result = None
+
+    def apply(self, input_data):
+        """Transforms input data, the same as transform(input_data, transform_config)
+
+        :param input_data: dict or list
+        :return: dict or list
+        """
+        plan = self.plan
+        self.flat_data = []
+        for rule, fields_found in zip(plan.rules, plan.find(input_data)):
+            rule_data = []
+            rule.emit(fields_found, rule_data)
+            self.flat_data.append(rule_data)
+        return self._rebuild()
+
+    __call__ = apply
+
+    def update(self, input_data, changed_paths):
+        """Applies again only rules with sources overlapping changed paths
+
+        :param input_data: changed dict or list
+        :param changed_paths: iterable of changed paths, see diff_paths
+        :return: dict or list, the same as apply(input_data)
+        """
+        if self.flat_data is None:
+            return self.apply(input_data)
+        changed_paths = [parse_path(path) for path in changed_paths]
+        plan = self.plan
+        patches = []
+        for rule_id, (src, rule) in enumerate(zip(plan.source_paths, plan.rules)):
+            if not any(paths_overlap(src, path) for path in changed_paths):
+                continue
+            rule_data = []
+            rule.emit(list(iter_matches(input_data, parse_path(src))), rule_data)
+            patches.append((rule_id, rule_data))
+        locations = self._locate(patches)
+        for rule_id, rule_data in patches:
+            self.flat_data[rule_id] = rule_data
+        if locations is None:
+            return self._rebuild()
+        for (container, key), value in locations:
+            container[key] = value
+        return self.result
+
+    def _rebuild(self):
+        """Builds the result from all rules and remembers which targets
+        can be changed in place later"""
+        self.owners = {}
+        self.interior = set()
+        list_indexes = {}
+        for rule_id, rule_data in enumerate(self.flat_data):
+            for target, _ in rule_data:
+                target = tuple(target)
+                self.owners[target] = rule_id
+                for idx in range(1, len(target)):
+                    self.interior.add(target[:idx])
+                for prefix in _list_prefixes(target):
+                    list_indexes.setdefault(prefix, set()).add(target[len(prefix)])
+        # build_tree moves items of sparse lists, their targets can't be patched
+        self.sparse = set()
+        for prefix, parts in list_indexes.items():
+            try:
+                indexes = sorted(int(part[1:]) for part in parts)
+            except ValueError:
+                indexes = None
+            if indexes != list(range(len(indexes or ()))):
+                self.sparse.add(prefix)
+        self.result = build_tree([item for rule_data in self.flat_data for item in rule_data])
+        return self.result
+
+    def _locate(self, patches):
+        """Finds containers and keys for new values of the rules
+
+        :return: list of ((container, key), value) or None when the result
+            must be rebuilt
+        """
+        if self.result is None:
+            return None
+        locations = []
+        for rule_id, rule_data in patches:
+            old_data = self.flat_data[rule_id]
+            if len(old_data) != len(rule_data):
+                return None
+            for (old_target, _), (target, value) in zip(old_data, rule_data):
+                target = tuple(target)
+                if tuple(old_target) != target or self.owners.get(target) != rule_id:
+                    return None
+                if target in self.interior:
+                    return None
+                if any(prefix in self.sparse for prefix in _list_prefixes(target)):
+                    return None
+                location = self._find_location(target)
+                if location is None:
+                    return None
+                locations.append((location, value))
+        return locations
+
+    def _find_location(self, target):
+        current_level = self.result
+        last = len(target) - 1
+        for idx, part in enumerate(target):
+            if isinstance(current_level, list):
+                if not (part.__class__ is str and part.startswith('#')):
+                    return None
+                try:
+                    part = int(part[1:])
+                except ValueError:
+                    return None
+                if not 0 <= part < len(current_level):
+                    return None
+            elif not isinstance(current_level, dict) or part not in current_level:
+                return None
+            if idx == last:
+                return current_level, part
+            current_level = current_level[part]
+        return None
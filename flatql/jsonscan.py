@@ -0,0 +1,262 @@
+import itertools
+import json
+import mmap
+import re
+import sys
+
+from flatql.engine import PathTrie
+from flatql.paths import INDEX, WILDCARD, parse_path
+
+# nesting skipped by one regex match, deeper containers are counted in Python
+SKIP_DEPTH = 8
+# values decoded as a whole are read in windows of this size, growing until the value fits
+WINDOW_SIZE = 1 << 16
+WINDOW_GROWTH = 16
+# possessive quantifiers are supported by re since Python 3.11
+POSSESSIVE = sys.version_info >= (3, 11)
+
+
+def _skip_pattern(depth, possessive=POSSESSIVE):
+    """Regex matching text, strings and containers nested up to depth levels,
+    it stops at the bracket closing the current container"""
+    if possessive:
+        def repeat(item):
+            return item + rb'*+'
+    else:
+        names = itertools.count()
+
+        def repeat(item):
+            # lookahead is atomic, the backreference takes what it matched
+            # without keeping positions to backtrack to
+            name = b'r%d' % next(names)
+            return rb'(?=(?P<%s>%s*))(?P=%s)' % (name, item, name)
+    text = rb'[^"\[\]{}]*+' if possessive else rb'[^"\[\]{}]*'
+    string = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+    pattern = text + repeat(rb'(?:' + string + text + rb')')
+    for _ in range(depth):
+        pattern = text + repeat(rb'(?:(?:' + string + rb'|[\[{]' + pattern + rb'[\]}])' + text + rb')')
+    return re.compile(pattern, re.DOTALL)
+
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_STRING = re.compile(rb'"([^"\\]*(?:\\.[^"\\]*)*)"', re.DOTALL)
+_SKIP = _skip_pattern(SKIP_DEPTH)
+_SCALAR = re.compile(rb'[^ \t\n\r,\]}]+')
+_DECODER = json.JSONDecoder()
+
+_QUOTE = ord('"')
+_COLON = ord(':')
+_COMMA = ord(',')
+_OPEN = (ord('{'), ord('['))
+_CLOSE = (ord('}'), ord(']'))
+_OBJECT_START, _ARRAY_START = _OPEN
+_OBJECT_END, _ARRAY_END = _CLOSE
+
+
+class _Scanner:
+    """Walks raw JSON with the trie, only matched values are decoded
+
+    Objects and arrays are scanned only along keys and list indexes of the paths,
+    methods get the position of the first character of a value and return
+    the position after it.
+    """
+
+    def __init__(self, data, trie):
+        self.data = data
+        self.trie = trie
+        self.results = [[] for _ in range(trie.size)]
+        self.decoded_nodes = {}
+
+    def error(self, pos):
+        return ValueError(f'invalid JSON at position {pos}')
+
+    def char(self, pos):
+        try:
+            return self.data[pos]
+        except IndexError:
+            raise self.error(pos) from None
+
+    def whitespace(self, pos):
+        return _WHITESPACE.match(self.data, pos).end()
+
+    def skip(self, pos):
+        data = self.data
+        char = self.char(pos)
+        if char == _QUOTE:
+            match = _STRING.match(data, pos)
+            if match is None:
+                raise self.error(pos)
+            return match.end()
+        if char in _OPEN:
+            return self.skip_rest(pos + 1, 1)
+        match = _SCALAR.match(data, pos)
+        if match is None:
+            raise self.error(pos)
+        return match.end()
+
+    def skip_rest(self, pos, depth):
+        """Skips the rest of depth nested objects and arrays"""
+        data = self.data
+        while depth:
+            pos = _SKIP.match(data, pos).end()
+            char = self.char(pos)
+            if char in _OPEN:
+                depth += 1
+            elif char in _CLOSE:
+                depth -= 1
+            else:
+                raise self.error(pos)
+            pos += 1
+        return pos
+
+    def load(self, pos, large):
+        if large:
+            # positions in ASCII text are the same as in bytes, the value can be
+            # decoded without finding its end first, from a window growing until it fits
+            data = self.data
+            size = WINDOW_SIZE
+            while True:
+                window = data[pos:pos + size]
+                if not window.isascii():
+                    break
+                at_end = pos + size >= len(data)
+                try:
+                    value, end = _DECODER.raw_decode(window.decode('ascii'))
+                except ValueError:
+                    if at_end:
+                        raise self.error(pos) from None
+                else:
+                    # a number can be cut by the end of the window
+                    if end < len(window) or at_end:
+                        return value, pos + end
+                size *= WINDOW_GROWTH
+        end = self.skip(pos)
+        return json.loads(bytes(self.data[pos:end])), end
+
+    def decoded(self, node):
+        """Checks if the value matched by node is decoded and walked in memory
+
+        Wildcards and negative indexes visit most of the value anyway,
+        json decodes it faster than it is scanned in Python.
+        """
+        result = self.decoded_nodes.get(id(node))
+        if result is None:
+            result = self.decoded_nodes[id(node)] = bool(node.terminals) or any(
+                segment.kind is WILDCARD or segment.kind is INDEX and segment.index < 0
+                for segment, _ in node.edges)
+        return result
+
+    def value(self, pos, nodes, need_end=True):
+        """Finds matches of nodes in the value
+
+        :param nodes: trie nodes matching the value
+        :param need_end: when False the rest of the document may be skipped
+        :return: position after the value
+        """
+        if any(self.decoded(node) for node in nodes):
+            # leaves are usually small, finding their end is cheaper than decoding all data
+            value, end = self.load(pos, any(node.edges for node in nodes))
+            for node in nodes:
+                self.trie.node_values(node, value, self.results)
+            return end
+        char = self.char(pos)
+        if char == _OBJECT_START:
+            return self.object(pos, nodes, need_end)
+        if char == _ARRAY_START:
+            return self.array(pos, nodes)
+        return self.skip(pos)
+
+    def key(self, pos):
+        match = _STRING.match(self.data, pos)
+        if match is None:
+            raise self.error(pos)
+        raw = match.group(1)
+        key = json.loads(match.group()) if b'\\' in raw else raw.decode()
+        return key, match.end()
+
+    def object(self, pos, nodes, need_end):
+        keys = {key for node in nodes for key in node.nodes}
+        seen = set()
+        pos = self.whitespace(pos + 1)
+        if self.char(pos) == _OBJECT_END:
+            pos += 1
+        else:
+            while True:
+                key, pos = self.key(pos)
+                pos = self.whitespace(pos)
+                if self.char(pos) != _COLON:
+                    raise self.error(pos)
+                pos = self.whitespace(pos + 1)
+                if key in keys and key not in seen:
+                    # the first value of a duplicated key is used, later ones are skipped
+                    seen.add(key)
+                    pos = self.value(pos, [node.nodes[key] for node in nodes if key in node.nodes])
+                else:
+                    pos = self.skip(pos)
+                pos = self.whitespace(pos)
+                char = self.char(pos)
+                if char == _OBJECT_END:
+                    pos += 1
+                    break
+                if char != _COMMA:
+                    raise self.error(pos)
+                pos = self.whitespace(pos + 1)
+                if len(seen) == len(keys):
+                    # nothing else can match, find the end without reading keys
+                    pos = self.skip_rest(pos, 1) if need_end else None
+                    break
+        # missing keys are found as None, the same as in find_in_paths
+        for key in keys - seen:
+            for node in nodes:
+                child = node.nodes.get(key)
+                if child is not None:
+                    for path_id in child.terminals:
+                        self.results[path_id].append(None)
+        return pos
+
+    def array(self, pos, nodes):
+        indexes = {}
+        for node in nodes:
+            for segment, child in node.edges:
+                if segment.kind is INDEX:
+                    indexes.setdefault(segment.index, []).append(child)
+        pos = self.whitespace(pos + 1)
+        if self.char(pos) == _ARRAY_END:
+            return pos + 1
+        idx = 0
+        while True:
+            children = indexes.pop(idx, None)
+            pos = self.whitespace(self.value(pos, children) if children else self.skip(pos))
+            idx += 1
+            char = self.char(pos)
+            if char == _ARRAY_END:
+                return pos + 1
+            if char != _COMMA:
+                raise self.error(pos)
+            pos = self.whitespace(pos + 1)
+            if not indexes:
+                return self.skip_rest(pos, 1)
+
+
+def find_in_json(source, paths):
+    """Finds values at the paths in JSON without decoding the whole document
+
+    Only matched values are decoded, the rest is skipped. Objects scanned
+    along the paths use the first value of a duplicated key, json.loads
+    keeps the last one.
+
+    :param source: bytes, mmap.mmap or binary file object with JSON
+    :param paths: the paths list, example: ['meta.id', 'items.*.name']
+    :return: list of found data, the same as find_in_paths(json.loads(source), paths)
+    """
+    if hasattr(source, 'read') and not isinstance(source, mmap.mmap):
+        source = source.read()
+    if isinstance(source, str):
+        source = source.encode()
+    trie = PathTrie([parse_path(path) for path in paths])
+    scanner = _Scanner(source, trie)
+    scanner.value(scanner.whitespace(0), [trie.root], need_end=False)
+    result = []
+    for values in scanner.results:
+        result.extend(values)
+    return result
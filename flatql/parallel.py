@@ -0,0 +1,79 @@
+import os
+import pickle
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from flatql.plan import compile_transform
+
+_plan = None
+
+
+def _init_worker(transform_config):
+    global _plan
+    _plan = compile_transform(transform_config)
+
+
+def _transform_chunk(chunk):
+    return [_plan(doc) for doc in chunk]
+
+
+def _chunks(docs, chunksize):
+    docs = iter(docs)
+    while True:
+        chunk = list(islice(docs, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def transform_many(docs, transform_config, workers=None, chunksize=256, ordered=True):
+    """Transforms documents in a pool of worker processes
+
+    The config is sent to every worker once, functions used in
+    (func, template) rules must be picklable (defined at module level).
+
+    :param docs: iterable of documents
+    :param transform_config: dict where the keys are source paths
+        and the values are destination paths
+    :param workers: number of processes, default: number of CPUs,
+        1 means transform in the current process
+    :param chunksize: number of documents sent to a worker at once
+    :param ordered: when False, results are returned as soon as they are ready
+    :return: iterator of results
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunksize < 1:
+        raise ValueError('chunksize must be greater than 0')
+    if workers == 1:
+        return map(compile_transform(transform_config), docs)
+    try:
+        pickle.dumps(transform_config)
+    except Exception as e:
+        raise ValueError(f'transform_config can not be sent to worker processes: {e}') from e
+    return _transform_many(docs, transform_config, workers, chunksize, ordered)
+
+
+def _transform_many(docs, transform_config, workers, chunksize, ordered):
+    max_pending = workers * 2
+    chunks = _chunks(docs, chunksize)
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(transform_config,)) as executor:
+        if ordered:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_transform_chunk, chunk))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        else:
+            pending = set()
+            for chunk in chunks:
+                pending.add(executor.submit(_transform_chunk, chunk))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            for future in wait(pending).done:
+                yield from future.result()
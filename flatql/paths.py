@@ -0,0 +1,404 @@
+from functools import lru_cache
+
+KEY = 'key'
+INDEX = 'index'
+WILDCARD = 'wildcard'
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+class Segment:
+    """Single parsed path part
+
+    :param kind: KEY, INDEX or WILDCARD
+    :param key: the raw path part, used as dict key, example: #1
+    :param index: list index for INDEX segments, example: 1
+    """
+    __slots__ = ('kind', 'key', 'index', 'name')
+
+    def __init__(self, kind, key, index=None):
+        self.kind = kind
+        self.key = key
+        self.index = index
+        self.name = f'#{index}' if kind is INDEX else key
+
+    def __eq__(self, other):
+        if isinstance(other, Segment):
+            return self.key == other.key
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f'Segment({self.kind}, {self.key!r})'
+
+
+class Path:
+    """Match path sharing its prefix with the other matches
+
+    Paths found under the same element point to the same parent,
+    the string is rendered only when needed.
+
+    :param parent: Path or None for the first part
+    :param part: path part, example: #0
+    """
+    __slots__ = ('parent', 'part')
+
+    def __init__(self, parent, part):
+        self.parent = parent
+        self.part = part
+
+    def parts(self):
+        """Returns all path parts
+
+        :return: tuple, example: ('b', '#0', 'name')
+        """
+        parts = [self.part]
+        parent = self.parent
+        while parent is not None:
+            parts.append(parent.part)
+            parent = parent.parent
+        parts.reverse()
+        return tuple(parts)
+
+    def __iter__(self):
+        return iter(self.parts())
+
+    def __len__(self):
+        length = 0
+        node = self
+        while node is not None:
+            length += 1
+            node = node.parent
+        return length
+
+    def __getitem__(self, idx):
+        if idx.__class__ is int and idx < 0:
+            # parts near the end are reached without rendering the whole path
+            node = self
+            for _ in range(-1 - idx):
+                node = node.parent
+                if node is None:
+                    raise IndexError('path index out of range')
+            return node.part
+        return self.parts()[idx]
+
+    def __str__(self):
+        parts = self.parts()
+        try:
+            return '.'.join(parts)
+        except TypeError:
+            return '.'.join(map(str, parts))
+
+    def __eq__(self, other):
+        if isinstance(other, Path):
+            return self.parts() == other.parts()
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    def __hash__(self):
+        # equal to the rendered string, so paths can be looked up by strings
+        return hash(str(self))
+
+    def __repr__(self):
+        return f'Path({str(self)!r})'
+
+
+def path_from_parts(parts, parent=None):
+    """Creates Path from path parts
+
+    :param parts: iterable of path parts, example: ('b', '#0')
+    :param parent: Path prefix, default=None
+    :return: Path or parent for empty parts
+    """
+    for part in parts:
+        parent = Path(parent, part)
+    return parent
+
+
+def parse_segment(part):
+    """Parses single path part
+
+    :param part: string, example: *, #-1 or name, other types are dict keys
+    :return: Segment
+    """
+    if not isinstance(part, str):
+        return Segment(KEY, part)
+    if part == '*':
+        return Segment(WILDCARD, part)
+    if part.startswith('#'):
+        try:
+            return Segment(INDEX, part, int(part[1:]))
+        except ValueError:
+            pass
+    return Segment(KEY, part)
+
+
+# segments are immutable, so paths share them
+_cached_segment = lru_cache(maxsize=DEFAULT_CACHE_SIZE * 4)(parse_segment)
+
+
+def _lookups(segments):
+    if any(segment.kind is WILDCARD for segment in segments):
+        return None
+    return tuple((segment.key, segment.index) for segment in segments)
+
+
+def _parse(path):
+    # literal lookups are kept with the segments, so both count in path_cache_info
+    parts = path.split('.') if isinstance(path, str) else path
+    segments = tuple(map(_cached_segment, parts))
+    return segments, _lookups(segments)
+
+
+_cached_parse = lru_cache(maxsize=DEFAULT_CACHE_SIZE)(_parse)
+
+
+def parse_path(path):
+    """Parses path into segments, results are kept in LRU cache
+
+    :param path: string or list of path parts, example: b.*.name,
+        already parsed paths are returned unchanged
+    :return: tuple of Segment
+    """
+    if not isinstance(path, str):
+        path = tuple(path)
+        if path and isinstance(path[0], Segment):
+            return path
+    return _cached_parse(path)[0]
+
+
+def literal_path(path):
+    """Precomputes lookups of the path without wildcards, results are kept in LRU cache
+
+    :param path: string or list of path parts, example: items.#1.name
+    :return: tuple of (dict key, list index), example: (('items', None), ('#1', 1), ('name', None)),
+        None for paths with wildcards
+    """
+    if not isinstance(path, str):
+        path = tuple(path)
+        if path and isinstance(path[0], Segment):
+            return _lookups(path)
+    return _cached_parse(path)[1]
+
+
+def literal_parts(lookups):
+    """Returns path parts of the element found by literal path
+
+    :param lookups: see literal_path
+    :return: tuple, example: ('items', '#1'), None when a list index is written
+        differently than matched elements are named, example: #01
+    """
+    parts = tuple(key for key, _ in lookups)
+    if any(index is not None and key != f'#{index}' for key, index in lookups):
+        return None
+    return parts
+
+
+def _segments_overlap(first, second):
+    if first.kind is KEY and second.kind is KEY:
+        return first.key == second.key
+    # negative indexes and inserts into lists move items between positions,
+    # a list can be replaced with a dict, which can have #N keys too
+    return True
+
+
+def paths_overlap(first, second):
+    """Checks if elements matched by one path can contain or be inside
+    elements matched by the other one
+
+    :param first: path, example: items.*.name
+    :param second: path, example: items.#1
+    :return: bool
+    """
+    return all(map(_segments_overlap, parse_path(first), parse_path(second)))
+
+def _rewrite_path(path, template):
+    path_parts = path.split('.')
+    template_parts = template.split('.')
+
+    for t in template_parts:
+        if t.startswith('{') and t.endswith('}'):
+            key_idx = int(t[1:-1])
+            if key_idx < len(path_parts):
+                key_name = path_parts[key_idx]
+                template = template.replace(t, key_name, 1)
+    return template
+
+
+class Template:
+    """Destination path template with literal parts and slots parsed once
+
+    :param template: template string, example: items.{1}.name
+    """
+    __slots__ = ('template', 'parts', 'texts', 'resolved')
+
+    def __init__(self, template):
+        self.template = template
+        self.texts = tuple(template.split('.'))
+        self.resolved = {}
+        parts = []
+        for part in self.texts:
+            if part.startswith('{') and part.endswith('}'):
+                try:
+                    parts.append(int(part[1:-1]))
+                except ValueError:
+                    parts = None
+                    break
+            elif '{' in part:
+                parts = None
+                break
+            else:
+                parts.append(part)
+        # templates rewrite_path handles in a special way are not compiled
+        self.parts = tuple(parts) if parts is not None else None
+
+    def resolve(self, source_length):
+        """Pre-resolves slots for source paths with source_length parts
+
+        :param source_length: number of parts in the source path
+        :return: tuple of literal parts and slot indexes, example: ('items', 1, 'name'),
+            None when the template can't be pre-resolved and must go through rewrite_path
+        """
+        resolved = self.resolved.get(source_length)
+        if resolved is None:
+            resolved = self.resolved[source_length] = self._resolve(source_length)
+        return resolved or None
+
+    def _resolve(self, source_length):
+        if self.parts is None:
+            return False
+        result = []
+        for part, text in zip(self.parts, self.texts):
+            if part.__class__ is not int:
+                result.append(part)
+            elif part >= source_length:
+                result.append(text)
+            elif part >= 0:
+                result.append(part)
+            elif part >= -source_length:
+                result.append(source_length + part)
+            else:
+                return False
+        return tuple(result)
+
+    def render(self, path_parts):
+        """Creates destination path parts for the source path parts
+
+        :param path_parts: tuple or Path, example: ('a', '#0', 'name')
+        :return: list, example: ['b', '#0', 'name']
+        """
+        if path_parts.__class__ is Path:
+            path_parts = path_parts.parts()
+        resolved = self.resolve(len(path_parts))
+        if resolved is None:
+            return _rewrite_path('.'.join(map(str, path_parts)), self.template).split('.')
+        return [path_parts[t] if t.__class__ is int else t for t in resolved]
+
+    def render_many(self, paths):
+        """Creates destination path parts for many source paths
+
+        :param paths: iterable of tuples or Path
+        :return: list of lists of parts
+        """
+        result = []
+        resolved = None
+        resolved_length = None
+        for path_parts in paths:
+            if path_parts.__class__ is Path:
+                path_parts = path_parts.parts()
+            length = len(path_parts)
+            if length != resolved_length:
+                resolved = self.resolve(length)
+                resolved_length = length
+            if resolved is None:
+                result.append(self.render(path_parts))
+            else:
+                result.append([path_parts[t] if t.__class__ is int else t for t in resolved])
+        return result
+
+    def __call__(self, path):
+        """Converts source path to destination path, the same as rewrite_path
+
+        :param path: string, example: a.#0.name
+        :return: string, example: b.#0.name
+        """
+        path_parts = path.split('.')
+        resolved = self.resolve(len(path_parts))
+        if resolved is None or '{' in path:
+            # parts with slots put into the template are replaced again by rewrite_path
+            return _rewrite_path(path, self.template)
+        return '.'.join([path_parts[t] if t.__class__ is int else t for t in resolved])
+
+    def __repr__(self):
+        return f'Template({self.template!r})'
+
+
+_cached_template = lru_cache(maxsize=DEFAULT_CACHE_SIZE)(Template)
+
+
+def parse_template(template):
+    """Parses destination path template, results are kept in LRU cache
+
+    :param template: template string, example: items.{1}.name
+    :return: Template
+    """
+    return _cached_template(template)
+
+
+def rewrite_path(path, template):
+    """Converts source path to destination path based on template
+
+    :param path: string, example: a.#0.name
+    :param template: template string, example: b.*.name
+    :return: string, example: b.#0.name
+    """
+    return _cached_template(template)(path)
+
+
+def compile_template(template, source_length):
+    """Pre-resolves template into a tuple of literal parts and slot indexes
+
+    :param template: template string, example: items.{1}.name
+    :param source_length: number of parts in the source path
+    :return: tuple, example: ('items', 1, 'name') or None when template
+        can't be pre-resolved and must go through rewrite_path
+    """
+    return _cached_template(template).resolve(source_length)
+
+
+def set_path_cache_size(maxsize):
+    """Replaces path and template caches with new ones
+
+    Path parts are cached too, up to 4 times maxsize.
+
+    :param maxsize: max number of cached paths and of cached templates, None means unbounded
+    """
+    global _cached_parse, _cached_segment, _cached_template
+    _cached_segment = lru_cache(maxsize=maxsize * 4 if maxsize is not None else None)(parse_segment)
+    _cached_parse = lru_cache(maxsize=maxsize)(_parse)
+    _cached_template = lru_cache(maxsize=maxsize)(Template)
+
+
+def path_cache_info():
+    """Returns path and template cache statistics
+
+    Lookups of paths by parse_path, literal_path and the functions using them
+    are counted together with lookups of templates.
+
+    :return: named tuple (hits, misses, maxsize, currsize), currsize counts
+        both paths and templates
+    """
+    paths = _cached_parse.cache_info()
+    templates = _cached_template.cache_info()
+    return paths._replace(hits=paths.hits + templates.hits, misses=paths.misses + templates.misses,
+                          currsize=paths.currsize + templates.currsize)
+
+
+def clear_path_cache():
+    """Removes all paths and templates from the caches and resets statistics"""
+    _cached_parse.cache_clear()
+    _cached_segment.cache_clear()
+    _cached_template.cache_clear()
@@ -0,0 +1,117 @@
+from functools import lru_cache
+
+from flatql.builder import build_tree
+from flatql.codegen import GeneratedTransform
+from flatql.engine import PathTrie, iter_matches, iter_path_matches, resolve
+from flatql.paths import literal_parts, literal_path, parse_path
+from flatql.rules import apply_instrumented, compile_rule
+
+# shorter paths take less memory as tuples of parts than as Path objects
+COMPACT_DEPTH = 5
+PLAN_CACHE_SIZE = 256
+
+_MISSING = object()
+
+
+class TransformPlan:
+    """Precompiled transform_config which can be applied to many documents"""
+
+    def __init__(self, transform_config):
+        self.source_paths = list(transform_config)
+        self.rules = [compile_rule(src, dst) for src, dst in transform_config.items()]
+        # sources without wildcards are found by direct lookups, the rest by the trie,
+        # every rule gets (lookups, parts) or position of its path in the trie
+        self.matchers = []
+        trie_paths = []
+        for src in transform_config:
+            lookups = literal_path(src)
+            parts = literal_parts(lookups) if lookups is not None else None
+            if parts is None:
+                self.matchers.append(len(trie_paths))
+                trie_paths.append(parse_path(src))
+            else:
+                self.matchers.append((lookups, parts))
+        self.sources = PathTrie(trie_paths)
+        self.trie_paths = trie_paths
+        self.compact = self.sources.depth >= COMPACT_DEPTH
+
+    def apply(self, input_data, hook=None):
+        """Transforms input data to another shape
+
+        :param input_data: dict or list
+        :param hook: flatql.profiling.Hook, default=None
+        :return: dict or list, the same as transform(input_data, transform_config)
+        """
+        if hook is not None:
+            return apply_instrumented(input_data, self.source_paths, self.rules, hook)
+        flat_data = []
+        for rule, fields_found in zip(self.rules, self.find(input_data)):
+            rule.emit(fields_found, flat_data)
+        return build_tree(flat_data)
+
+    def find(self, input_data):
+        """Finds elements for source paths of all rules
+
+        :param input_data: dict or list
+        :return: list with list of (path parts, value) for every rule
+        """
+        size = self.sources.size
+        if size == 1:
+            # a single path is walked faster without the trie
+            matches = iter_path_matches if self.compact else iter_matches
+            found = [list(matches(input_data, self.trie_paths[0]))]
+        else:
+            found = self.sources.find(input_data, self.compact) if size else ()
+        result = []
+        for matcher in self.matchers:
+            if matcher.__class__ is int:
+                result.append(found[matcher])
+            else:
+                value = resolve(input_data, matcher[0], _MISSING)
+                result.append([] if value is _MISSING else [(matcher[1], value)])
+        return result
+
+    __call__ = apply
+
+
+def compile_transform(transform_config, backend='default'):
+    """Compiles transform config into a reusable plan
+
+    :param transform_config: dict where the keys are source paths
+        and the values are destination paths
+    :param backend: default - rules evaluated by the path engine,
+        codegen - rules compiled to Python source (see plan.source)
+    :return: plan, call it with input data
+    """
+    if backend == 'codegen':
+        return GeneratedTransform(transform_config)
+    if backend != 'default':
+        raise ValueError(f'unknown backend {backend}')
+    return TransformPlan(transform_config)
+
+
+def _plan_from_items(config_items):
+    return TransformPlan(dict(config_items))
+
+
+_cached_plan = lru_cache(maxsize=PLAN_CACHE_SIZE)(_plan_from_items)
+
+
+def cached_plan(transform_config):
+    """Returns the plan of transform config, plans of hashable configs are kept in LRU cache
+
+    :param transform_config: dict where the keys are source paths
+        and the values are destination paths
+    :return: TransformPlan
+    """
+    config_items = tuple(transform_config.items())
+    try:
+        hash(config_items)
+    except TypeError:
+        return TransformPlan(transform_config)
+    return _cached_plan(config_items)
+
+
+def clear_plan_cache():
+    """Removes all plans from the cache"""
+    _cached_plan.cache_clear()
@@ -0,0 +1,116 @@
+class Hook:
+    """Instrumentation callbacks, subclass it and override needed methods
+
+    Pass the hook to transform, find or find_in_paths as hook argument.
+    """
+
+    def on_find(self, path, elapsed, matches, nodes):
+        """Called after every find
+
+        :param path: the path string, example: b.*.name
+        :param elapsed: time in seconds
+        :param matches: number of found elements
+        :param nodes: number of visited document nodes
+        """
+
+    def on_rule(self, src, elapsed, matches, nodes):
+        """Called after every transform rule
+
+        :param src: source path of the rule
+        :param elapsed: time in seconds, including the rule function
+        :param matches: number of found elements
+        :param nodes: number of visited document nodes
+        """
+
+    def on_callable(self, src, elapsed, calls):
+        """Called after the function of (func, template) rule was used
+
+        :param src: source path of the rule
+        :param elapsed: time in seconds spent in the function
+        :param calls: number of function calls
+        """
+
+    def on_build(self, elapsed, items):
+        """Called after the transform result was built
+
+        :param elapsed: time in seconds
+        :param items: number of (path, value) items in the result
+        """
+
+
+class Stats:
+    """Accumulated statistics of a single rule or path"""
+    __slots__ = ('calls', 'elapsed', 'matches', 'nodes', 'callable_elapsed', 'callable_calls')
+
+    def __init__(self):
+        self.calls = 0
+        self.elapsed = 0.0
+        self.matches = 0
+        self.nodes = 0
+        self.callable_elapsed = 0.0
+        self.callable_calls = 0
+
+
+class Profiler(Hook):
+    """Hook collecting statistics per rule and per path"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Removes collected statistics"""
+        self.rules = {}
+        self.finds = {}
+        self.build_calls = 0
+        self.build_elapsed = 0.0
+        self.build_items = 0
+
+    def _add(self, stats, key, elapsed, matches, nodes):
+        item = stats.get(key)
+        if item is None:
+            item = stats[key] = Stats()
+        item.calls += 1
+        item.elapsed += elapsed
+        item.matches += matches
+        item.nodes += nodes
+        return item
+
+    def on_find(self, path, elapsed, matches, nodes):
+        self._add(self.finds, path, elapsed, matches, nodes)
+
+    def on_rule(self, src, elapsed, matches, nodes):
+        self._add(self.rules, src, elapsed, matches, nodes)
+
+    def on_callable(self, src, elapsed, calls):
+        item = self.rules.get(src)
+        if item is None:
+            item = self.rules[src] = Stats()
+        item.callable_elapsed += elapsed
+        item.callable_calls += calls
+
+    def on_build(self, elapsed, items):
+        self.build_calls += 1
+        self.build_elapsed += elapsed
+        self.build_items += items
+
+    def report(self, limit=None):
+        """Creates text summary, slowest rules and paths first
+
+        :param limit: max number of rows in every section
+        :return: string
+        """
+        lines = []
+        for title, stats in (('rule', self.rules), ('find', self.finds)):
+            if not stats:
+                continue
+            lines.append(f'{title:<40} {"calls":>7} {"matches":>9} {"nodes":>10} '
+                         f'{"total ms":>10} {"func ms":>9}')
+            rows = sorted(stats.items(), key=lambda item: item[1].elapsed, reverse=True)
+            for key, item in rows[:limit]:
+                lines.append(f'{key:<40} {item.calls:>7} {item.matches:>9} {item.nodes:>10} '
+                             f'{item.elapsed * 1000:>10.3f} {item.callable_elapsed * 1000:>9.3f}')
+            lines.append('')
+        if self.build_calls:
+            lines.append(f'build: {self.build_calls} calls, {self.build_items} items, '
+                         f'{self.build_elapsed * 1000:.3f} ms')
+        return '\n'.join(lines).rstrip('\n')
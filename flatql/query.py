@@ -0,0 +1,95 @@
+from itertools import islice
+
+from flatql.engine import iter_matches, iter_values, render_path
+from flatql.paths import parse_path
+
+
+class Query:
+    """Lazy view of elements matching the path
+
+    The document is walked only when the results are requested and only
+    as far as needed, path strings are built only by items() and paths().
+
+    :param input_data: dict or list
+    :param path: the path, example: b.*.name
+    """
+    __slots__ = ('input_data', 'path')
+
+    def __init__(self, input_data, path):
+        self.input_data = input_data
+        self.path = parse_path(path)
+
+    def __iter__(self):
+        return iter_values(self.input_data, self.path)
+
+    def items(self):
+        """Iterates over found elements
+
+        :return: iterator of (path, value)
+        """
+        for parts, value in iter_matches(self.input_data, self.path):
+            yield render_path(parts), value
+
+    def paths(self):
+        """Iterates over paths of found elements
+
+        :return: iterator of paths, example: b.#0.name
+        """
+        for parts, _ in iter_matches(self.input_data, self.path):
+            yield render_path(parts)
+
+    def first(self, default=None):
+        """Returns the first found value
+
+        :param default: value returned if nothing was found
+        :return: value
+        """
+        for value in self:
+            return value
+        return default
+
+    def exists(self):
+        """Checks if anything matches the path
+
+        :return: bool
+        """
+        for _ in self:
+            return True
+        return False
+
+    def count(self):
+        """Counts found elements
+
+        :return: int
+        """
+        count = 0
+        for _ in self:
+            count += 1
+        return count
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if (key.start or 0) < 0 or (key.stop or 0) < 0 or (key.step or 1) < 0:
+                return list(self)[key]
+            return list(islice(self, key.start, key.stop, key.step))
+        if key < 0:
+            return list(self)[key]
+        for value in islice(self, key, None):
+            return value
+        raise IndexError('query index out of range')
+
+    # no __len__, list(query) would walk the document twice to get the length first
+    __bool__ = exists
+
+    def __repr__(self):
+        return f'Query({render_path(segment.key for segment in self.path)!r})'
+
+
+def query(input_data, path):
+    """Creates lazy view of elements matching the path
+
+    :param input_data: dict or list
+    :param path: the path, example: b.*.name
+    :return: Query
+    """
+    return Query(input_data, path)
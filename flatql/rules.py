@@ -0,0 +1,142 @@
+from time import perf_counter
+
+from flatql.builder import build_tree
+from flatql.engine import counting_children, iter_matches, render_path
+from flatql.paths import compile_template, parse_path, parse_template
+
+
+class CopyRule:
+    """Rule without destination, keeps the source path"""
+    __slots__ = ()
+
+    def emit(self, fields_found, flat_data):
+        flat_data.extend(fields_found)
+
+
+class ConstantRule:
+    """Rule with a destination path without slots"""
+    __slots__ = ('target',)
+
+    def __init__(self, target):
+        self.target = target
+
+    def emit(self, fields_found, flat_data):
+        target = self.target
+        for _, value in fields_found:
+            flat_data.append((target, value))
+
+
+class TemplateRule:
+    """Rule with a destination path with {N} slots
+
+    :param template: tuple of literal parts and negative slot indexes
+    """
+    __slots__ = ('template',)
+
+    def __init__(self, template):
+        self.template = template
+
+    def emit(self, fields_found, flat_data):
+        template = self.template
+        for path_parts, value in fields_found:
+            target = [path_parts[t] if t.__class__ is int else t for t in template]
+            flat_data.append((target, value))
+
+
+class RewriteRule:
+    """Rule with a destination template handled by rewrite_path"""
+    __slots__ = ('template',)
+
+    def __init__(self, template):
+        self.template = parse_template(template)
+
+    def emit(self, fields_found, flat_data):
+        render = self.template.render
+        for path_parts, value in fields_found:
+            flat_data.append((render(path_parts), value))
+
+
+def target_parts(target_path):
+    """Converts the destination path returned by a rule function to path parts
+
+    :param target_path: string split on dots or tuple of parts used as they are,
+        example: 'a.b.#0' or ('a.b', '#0')
+    :return: path parts
+    """
+    return target_path.split('.') if isinstance(target_path, str) else target_path
+
+
+class FunctionRule:
+    """Rule with a (func, *args) destination"""
+    __slots__ = ('func', 'args')
+
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+
+    def emit(self, fields_found, flat_data):
+        func = self.func
+        args = self.args
+        for path_parts, value in fields_found:
+            target_path, result = func(value, render_path(path_parts), *args)
+            flat_data.append((target_parts(target_path), result))
+
+
+def compile_rule(src, dst):
+    """Chooses rule implementation for a single transform_config entry
+
+    :param src: source path, example: list.*.id
+    :param dst: None, template string or tuple (func, *args)
+    :return: rule
+    """
+    if dst is None:
+        return CopyRule()
+    if isinstance(dst, str):
+        length = len(parse_path(src))
+        template = compile_template(dst, length)
+        if template is None:
+            return RewriteRule(dst)
+        if not any(t.__class__ is int for t in template):
+            return ConstantRule(template)
+        # every match has the same length, slots counted from the end
+        # don't need the whole Path, see flatql.paths.Path
+        return TemplateRule(tuple(t - length if t.__class__ is int else t for t in template))
+    return FunctionRule(dst[0], tuple(dst[1:]))
+
+
+def _timed(func, timer):
+    def timed(*args):
+        start = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            timer[0] += perf_counter() - start
+            timer[1] += 1
+    return timed
+
+
+def apply_instrumented(input_data, source_paths, rules, hook):
+    """Applies rules one by one reporting statistics to the hook
+
+    :param input_data: dict or list
+    :param source_paths: list of source paths
+    :param rules: list of rules, see compile_rule
+    :param hook: flatql.profiling.Hook
+    :return: dict or list
+    """
+    flat_data = []
+    for src, rule in zip(source_paths, rules):
+        counter = [0]
+        start = perf_counter()
+        fields_found = list(iter_matches(input_data, parse_path(src), counting_children(counter)))
+        if isinstance(rule, FunctionRule):
+            timer = [0.0, 0]
+            FunctionRule(_timed(rule.func, timer), rule.args).emit(fields_found, flat_data)
+            hook.on_callable(src, timer[0], timer[1])
+        else:
+            rule.emit(fields_found, flat_data)
+        hook.on_rule(src, perf_counter() - start, len(fields_found), counter[0])
+    start = perf_counter()
+    result = build_tree(flat_data)
+    hook.on_build(perf_counter() - start, len(flat_data))
+    return result
@@ -0,0 +1,67 @@
+import json
+
+from flatql.plan import compile_transform
+
+ERRORS = ('strict', 'skip', 'collect')
+
+
+def transform_stream(source, transform_config, batch_size=None, errors='strict', failures=None):
+    """Transforms documents one by one without loading all of them
+
+    :param source: file object with NDJSON, iterable of JSON lines
+        or iterable of documents
+    :param transform_config: dict where the keys are source paths
+        and the values are destination paths
+    :param batch_size: when set, results are yielded as lists of this size
+    :param errors: strict - raise on first failure, skip - ignore failed records,
+        collect - append (position, record, exception) to failures
+    :param failures: list for collected failures, required for errors='collect'
+    :return: iterator of results or lists of results
+    """
+    if errors not in ERRORS:
+        raise ValueError(f'errors must be one of {", ".join(ERRORS)}')
+    if errors == 'collect' and failures is None:
+        raise ValueError('failures list is required for errors=collect')
+    return _transform_stream(source, compile_transform(transform_config), batch_size,
+                             errors, failures)
+
+
+def _transform_stream(source, plan, batch_size, errors, failures):
+    batch = []
+    for position, record in enumerate(source, 1):
+        try:
+            if isinstance(record, (str, bytes, bytearray)):
+                if not record.strip():
+                    continue
+                record = json.loads(record)
+            result = plan(record)
+        except Exception as e:
+            if errors == 'strict':
+                raise
+            if errors == 'collect':
+                failures.append((position, record, e))
+            continue
+        if batch_size:
+            batch.append(result)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        else:
+            yield result
+    if batch:
+        yield batch
+
+
+def write_stream(results, output):
+    """Writes results to the file as NDJSON
+
+    :param results: iterable of results
+    :param output: text file object
+    :return: number of written lines
+    """
+    count = 0
+    for result in results:
+        output.write(json.dumps(result))
+        output.write('\n')
+        count += 1
+    return count
@@ -1,4 +1,11 @@
-from flatql.helpers import convert_pseudo_list, simple_rewrite
+from time import perf_counter
+
+from flatql.engine import (PathTrie, counting_children, iter_matches, iter_path_matches,
+                           iter_rendered_matches, iter_values, render_path, resolve)
+from flatql.paths import INDEX, literal_parts, literal_path, parse_path, path_from_parts, rewrite_path
+from flatql.plan import cached_plan
+
+_MISSING = object()
 
 def get_in(input_data, path, default=None):
     """Get the value at the path in input_data.
@@ -10,10 +17,22 @@ def get_in(input_data, path, default=None):
     """
     if '*' in path:
         raise ValueError('* in path is not supported')
-    found = find(input_data, path.split('.'))
-    if found:
-        return found[0][1]
-    return default
+    return resolve(input_data, literal_path(path), default)
+
+def get_in_many(input_data, paths, default=None):
+    """Get values at many paths in input_data.
+
+    :param input_data: dict or list
+    :param paths: the paths of the values to get, example: ['id', 'item.#1.name']
+    :param default: value returned for paths where nothing was found
+    :return: list of values in order of paths
+    """
+    lookups = []
+    for path in paths:
+        if '*' in path:
+            raise ValueError('* in path is not supported')
+        lookups.append(literal_path(path))
+    return [resolve(input_data, path_lookups, default) for path_lookups in lookups]
 
 def set_in(input_data, path, value):
     """Set the value at the path in input_data.
@@ -25,26 +44,160 @@ def set_in(input_data, path, value):
     """
     if '*' in path:
         raise ValueError('* in path is not supported')
-    path_parts = path.split('.')
-    current_path_part = path_parts[0] if path_parts else None
-    if current_path_part:
+    return _set_in(input_data, parse_path(path), 0, value)
+
+def _set_in(input_data, segments, level, value):
+    segment = segments[level] if level < len(segments) else None
+    if segment and segment.key:
         if not input_data:
-            input_data = [] if current_path_part.startswith('#') else {}
+            input_data = [] if segment.key.startswith('#') else {}
         if isinstance(input_data, list):
-            idx = int(current_path_part[1:])
+            if segment.kind is not INDEX:
+                raise ValueError(f'{segment.key} is not a list index')
+            idx = segment.index
             data = input_data[idx] if input_data and len(input_data) > idx else None
-            result = set_in(data, '.'.join(path_parts[1:]), value)
+            result = _set_in(data, segments, level + 1, value)
             if data:
                 input_data[idx] = result
             else:
                 input_data.insert(idx, result)
         elif isinstance(input_data, dict):
-            data = input_data.get(current_path_part)
-            input_data[current_path_part] = set_in(data, '.'.join(path_parts[1:]), value)
+            data = input_data.get(segment.key)
+            input_data[segment.key] = _set_in(data, segments, level + 1, value)
     else:
         return value
     return input_data
 
+def assoc_in(input_data, path, value):
+    """Set the value at the path in a copy of input_data.
+
+    Only containers on the path are copied, the rest is shared with input_data,
+    which is not changed.
+
+    :param input_data: dict or list
+    :param path: the path of the value to set, example: item.#1.name
+    :param value: value to set
+    :return: new dict or list
+    """
+    if '*' in path:
+        raise ValueError('* in path is not supported')
+    return _assoc_in(input_data, parse_path(path), 0, value)
+
+def _assoc_in(input_data, segments, level, value):
+    # the same as _set_in, but containers are copied before they are changed
+    segment = segments[level] if level < len(segments) else None
+    if not (segment and segment.key):
+        return value
+    if not input_data:
+        input_data = [] if segment.key.startswith('#') else {}
+    if isinstance(input_data, list):
+        if segment.kind is not INDEX:
+            raise ValueError(f'{segment.key} is not a list index')
+        idx = segment.index
+        data = input_data[idx] if input_data and len(input_data) > idx else None
+        result = _assoc_in(data, segments, level + 1, value)
+        input_data = list(input_data)
+        if data:
+            input_data[idx] = result
+        else:
+            input_data.insert(idx, result)
+    elif isinstance(input_data, dict):
+        input_data = dict(input_data)
+        input_data[segment.key] = _assoc_in(input_data.get(segment.key), segments, level + 1, value)
+    return input_data
+
+def set_in_many(input_data, values):
+    """Set many values in input_data in one pass.
+
+    Paths with shared prefixes are walked once. List indexes after the end
+    of the list are appended in order of indexes, existing items are replaced.
+    Unlike set_in, falsy items (None, 0, '', empty containers) are replaced too,
+    set_in inserts the new item before them.
+
+    :param input_data: dict or list
+    :param values: dict where the keys are paths and the values are values to set,
+        example: {'item.#0.name': 'Item 1', 'item.#0.id': 1}
+    :return: modified input_data
+    """
+    writes = []
+    for path, value in values.items():
+        if '*' in path:
+            raise ValueError('* in path is not supported')
+        writes.append((parse_path(path), value, None))
+    return _set_many(input_data, writes, 0)
+
+def update_in(input_data, path, func, *args):
+    """Update the value at the path in input_data with func(value, *args).
+
+    :param input_data: dict or list
+    :param path: the path of the value to update, example: item.#1.count
+    :param func: function called with the current value (None if missing)
+    :return: modified input_data
+    """
+    if '*' in path:
+        raise ValueError('* in path is not supported')
+    return _set_many(input_data, [(parse_path(path), args, func)], 0)
+
+def _set_many(input_data, writes, level):
+    pending = []
+    for write in writes:
+        segments, value, func = write
+        if level == len(segments) or not segments[level].key:
+            if func is None:
+                pending = []
+                input_data = value
+            else:
+                if pending:
+                    input_data = _set_children(input_data, pending, level)
+                    pending = []
+                input_data = func(input_data, *value)
+        else:
+            pending.append(write)
+    if pending:
+        input_data = _set_children(input_data, pending, level)
+    return input_data
+
+def _set_children(input_data, writes, level):
+    if not input_data:
+        input_data = [] if writes[0][0][level].key.startswith('#') else {}
+    groups = {}
+    if isinstance(input_data, list):
+        length = len(input_data)
+        new_items = {}
+        for write in writes:
+            segment = write[0][level]
+            if segment.kind is not INDEX:
+                raise ValueError(f'{segment.key} is not a list index')
+            idx = segment.index
+            if idx >= length or not length:
+                new_items.setdefault(idx, []).append(write)
+            elif idx < -length:
+                raise IndexError(f'list index {segment.key} out of range')
+            else:
+                groups.setdefault(idx % length, []).append(write)
+        if new_items:
+            # appended in order of indexes, missing indexes are skipped
+            for position, idx in enumerate(sorted(new_items), length):
+                groups[position] = new_items[idx]
+            input_data.extend([None] * len(new_items))
+        for position, group in groups.items():
+            input_data[position] = _set_many(input_data[position], group, level + 1)
+    elif isinstance(input_data, dict):
+        leaf_level = level + 1
+        for write in writes:
+            segments = write[0]
+            key = segments[level].key
+            if key in groups:
+                groups[key].append(write)
+            elif len(segments) == leaf_level and write[2] is None:
+                # the most common case, last part of path
+                input_data[key] = write[1]
+            else:
+                groups[key] = [write]
+        for key, group in groups.items():
+            input_data[key] = _set_many(input_data.get(key), group, level + 1)
+    return input_data
+
 def find_in_path(input_data, path):
     """Finds values at the path in input_data.
 
@@ -52,107 +205,94 @@ def find_in_path(input_data, path):
     :param path: the path of the values example: b.*.name
     :result: list of found data
     """
-    result = find(input_data, path.split('.'))
-    return [value for _, value in result if value]
+    return [value for value in iter_values(input_data, parse_path(path)) if value]
 
-def find_in_paths(input_data, paths):
+def find_in_paths(input_data, paths, hook=None):
     """Finds values at the paths in input_data.
 
     :param input_data: dict or list
     :param paths: the paths list, example: ['a.b.c', b.*.name]
+    :param hook: flatql.profiling.Hook, default=None
     :result: list of found data
     """
     result = []
-    for path in paths:
-        references = find(input_data, path.split('.'))
-        for _, refs in references:
-            result.append(refs)
+    if hook is not None:
+        for path in paths:
+            result.extend(_find_instrumented(input_data, path, hook, False))
+        return result
+    for values in PathTrie([parse_path(path) for path in paths]).values(input_data):
+        result.extend(values)
     return result
 
-def find(input_data, path, current_path=None):
+def find(input_data, path, current_path=None, hook=None, compact=False):
     """Finds all elements based on path
 
     :param input_data: dict or list
     :param path: the path list, example: b.*.name
     :param current_path: the current path, default=None
+    :param hook: flatql.profiling.Hook, default=None
+    :param compact: return flatql.paths.Path instead of strings, paths share
+        their prefixes and are rendered with str(path)
     :return: list elements of shape (path, value)
     """
-    fields_found = []
-    if isinstance(input_data, dict) and path:
-        if path[0] == '*':
-            for key, value in input_data.items():
-                new_path = f'{current_path}.{key}' if current_path else key
-                fields_found.extend(find(value, path[1:], new_path))
-        else:
-            new_path = f'{current_path}.{path[0]}' if current_path else path[0]
-            fields_found.extend(find(input_data.get(path[0]), path[1:], new_path))
-    elif isinstance(input_data, list) and path:
-        if path[0] == '*':
-            for idx, item in enumerate(input_data):
-                new_path = f'{current_path}.#{idx}' if current_path else f'#{idx}'
-                fields_found.extend(find(item, path[1:], new_path))
-        elif path[0].startswith('#'):
-            idx = int(path[0][1:])
-            if (0 <= idx < len(input_data)) or (-len(input_data) <= idx < 0):
-                new_path = f'{current_path}.#{idx}' if current_path else f'#{idx}'
-                fields_found.extend(find(input_data[idx], path[1:], new_path))
-    elif not path:
-        fields_found.append((current_path, input_data))
-    return fields_found
-
-def rewrite_path(path, template):
-    """Converts source path to destination path based on template
-
-    :param path: string, example: a.#0.name
-    :param template: template string, example: b.*.name
-    :return: string, example: b.#0.name
+    if hook is not None and path:
+        found = _find_instrumented(input_data, path, hook, True)
+        if compact:
+            parent = _prefix(current_path)
+            return [(path_from_parts(parts, parent), value) for parts, value in found]
+        return [(render_path(parts, current_path), value) for parts, value in found]
+    return list(iter_find(input_data, path, current_path, compact))
+
+def _find_instrumented(input_data, path, hook, with_paths):
+    segments = parse_path(path)
+    counter = [0]
+    start = perf_counter()
+    if with_paths:
+        result = list(iter_matches(input_data, segments, counting_children(counter)))
+    else:
+        result = list(iter_values(input_data, segments, counting_children(counter)))
+    hook.on_find(render_path(segment.key for segment in segments), perf_counter() - start,
+                 len(result), counter[0])
+    return result
+
+def _prefix(current_path):
+    return path_from_parts(current_path.split('.')) if current_path else None
+
+def iter_find(input_data, path, current_path=None, compact=False):
+    """Iterates over all elements based on path
+
+    :param input_data: dict or list
+    :param path: the path list, example: b.*.name
+    :param current_path: the current path, default=None
+    :param compact: yield flatql.paths.Path instead of strings
+    :return: iterator of elements of shape (path, value)
     """
-    path_parts = path.split('.')
-    template_parts = template.split('.')
-
-    for t in template_parts:
-        if t.startswith('{') and t.endswith('}'):
-            key_idx = int(t[1:-1])
-            if key_idx < len(path_parts):
-                key_name = path_parts[key_idx]
-                template = template.replace(t, key_name, 1)
-    return template
-
-def transform(input_data, transform_config):
+    if compact:
+        yield from iter_path_matches(input_data, parse_path(path) if path else (),
+                                     parent=_prefix(current_path))
+        return
+    if not path:
+        yield (current_path, input_data)
+        return
+    lookups = literal_path(path)
+    parts = literal_parts(lookups) if lookups is not None else None
+    if parts is not None:
+        value = resolve(input_data, lookups, _MISSING)
+        if value is not _MISSING:
+            yield (render_path(parts, current_path), value)
+        return
+    yield from iter_rendered_matches(input_data, parse_path(path), current_path)
+
+def transform(input_data, transform_config, hook=None):
     """Transforms input data to another shape based on config
 
     :param input_data: dict or list
     :param transform_config: dict where the keys are source paths
         and the values are destination paths
+    :param hook: flatql.profiling.Hook, default=None
     :return: dict or list
     """
-    flat_data = []
-    for src, dst in transform_config.items():
-        fields_found = find(input_data, src.split('.'), None)
-        for field in fields_found:
-            if dst is None:
-                flat_data.append((field[0], field[1]))
-            elif isinstance(dst, str):
-                target_path = rewrite_path(field[0], dst)
-                result = simple_rewrite(field[0], target_path, field[1])
-                flat_data.append(result)
-            else:
-                func = dst[0]
-                args = dst[1:]
-                result = func(field[1], field[0], *args)
-                flat_data.append(result)
-    result = {}
-    for path, value in flat_data:
-        current_level = result
-        path_parts = path.split('.')
-        path_parts_length = len(path_parts)
-        for idx, p in enumerate(path_parts):
-            if idx == path_parts_length - 1: # last
-                current_level[p] = value
-            else:
-                current_level.setdefault(p, {})
-                current_level = current_level[p]
-    return convert_pseudo_list(result)
+    return cached_plan(transform_config).apply(input_data, hook)
 
 def extract(input_data, paths):
     """Extracts only particular paths from input data
@@ -0,0 +1,61 @@
+import asyncio
+import unittest
+from flatql import atransform, atransform_stream, rewrite_path, transform
+
+
+class FakeCache:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    async def lookup(self, item, path, template):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return (rewrite_path(path, template), {'id': item, 'cached': True})
+
+
+def sync_item(item, path, template):
+    return (rewrite_path(path, template), item)
+
+
+class TestAio(unittest.IsolatedAsyncioTestCase):
+    async def test_atransform(self):
+        cache = FakeCache()
+        data = {'id': 1, 'authors': [1, 2, 3], 'tags': ['a']}
+        config = {'id': 'uuid',
+                  'authors.*': (cache.lookup, 'creators.{1}'),
+                  'tags.*': (sync_item, 'labels.{1}')}
+        result = await atransform(data, config)
+        expected = {'uuid': 1,
+                    'creators': [{'id': 1, 'cached': True}, {'id': 2, 'cached': True},
+                                 {'id': 3, 'cached': True}],
+                    'labels': ['a']}
+        self.assertEqual(result, expected)
+        self.assertEqual(cache.max_running, 3)
+        self.assertEqual(await atransform(data, {'id': 'uuid', 'tags.*': (sync_item, 'labels.{1}')}),
+                         transform(data, {'id': 'uuid', 'tags.*': (sync_item, 'labels.{1}')}))
+        self.assertEqual(await atransform(data, {'id': (lambda item, path: (('a.b',), item),)}),
+                         {'a.b': 1})
+
+    async def test_atransform_stream(self):
+        cache = FakeCache()
+        read = []
+
+        async def documents():
+            for idx in range(10):
+                read.append(idx)
+                yield {'id': idx}
+
+        config = {'id': (cache.lookup, 'item')}
+        results = []
+        async for result in atransform_stream(documents(), config, concurrency=3):
+            results.append(result['item']['id'])
+            self.assertLessEqual(len(read) - len(results), 3)
+        self.assertEqual(results, list(range(10)))
+        self.assertEqual(cache.max_running, 3)
+
+    async def test_atransform_stream_from_iterable(self):
+        results = [result async for result in atransform_stream([{'id': 1}], {'id': 'uuid'})]
+        self.assertEqual(results, [{'uuid': 1}])
@@ -0,0 +1,30 @@
+import unittest
+from flatql.builder import build_tree
+from flatql.paths import Path, path_from_parts
+
+
+class TestBuilder(unittest.TestCase):
+    def test_build_tree(self):
+        flat_data = [(('items', '#1', 'name'), 'B'),
+                     (('items', '#0', 'name'), 'A'),
+                     (('items', '#1', 'id'), 2),
+                     (('sparse', '#5'), 'x'),
+                     (('empty',), {})]
+        expected = {'items': [{'name': 'A'}, {'name': 'B', 'id': 2}],
+                    'sparse': ['x'],
+                    'empty': {}}
+        self.assertEqual(build_tree(flat_data), expected)
+        self.assertEqual(build_tree([(('#0',), 1), (('#1',), 2)]), [1, 2])
+        self.assertIsNone(build_tree([]))
+
+    def test_build_tree_paths(self):
+        item = path_from_parts(['items', '#0'])
+        flat_data = [(Path(item, 'name'), 'A'),
+                     (Path(item, 'id'), 1),
+                     (('items', '#1', 'name'), 'B'),
+                     (Path(path_from_parts(['items', '#1']), 'id'), 2)]
+        self.assertEqual(build_tree(flat_data),
+                         {'items': [{'name': 'A', 'id': 1}, {'name': 'B', 'id': 2}]})
+        # a value replacing a container which was created for a path prefix
+        flat_data = [(Path(item, 'name'), 'A'), (item, {'id': 1}), (Path(item, 'uuid'), 2)]
+        self.assertEqual(build_tree(flat_data), {'items': [{'id': 1, 'uuid': 2}]})
@@ -0,0 +1,47 @@
+import unittest
+from flatql import compile_transform, find, rewrite_path, transform
+from flatql.codegen import GeneratedFind, compile_find
+
+
+def transform_item(item, path, template):
+    return (rewrite_path(path, template), {'id': item['id']})
+
+
+class TestCodegen(unittest.TestCase):
+    data = {'count': 2,
+            'meta': {'#01': 'raw key'},
+            'entries': [
+                {'res_name': 'A', 'authors': [{'id': 1, 'res_name': 'Author 1'},
+                                              {'id': 2, 'res_name': 'Author 2'}]},
+                {'res_name': 'B', 'authors': [{'id': 4, 'res_name': 'Author 4'}]}]}
+
+    def test_find_same_as_find(self):
+        paths = ['count', 'missing', 'missing.key', 'entries.*.res_name',
+                 'entries.#-1.authors.*.id', 'entries.#5', 'meta.#01', '*.*',
+                 'entries.*.authors.#0', 'count.x', 'entries.name']
+        for path in paths:
+            self.assertEqual(GeneratedFind(path)(self.data), find(self.data, path.split('.')))
+        self.assertEqual(GeneratedFind([])(self.data), [(None, self.data)])
+
+    def test_compile_find_source(self):
+        compiled = compile_find('entries.*.res_name')
+        self.assertIs(compiled, compile_find('entries.*.res_name'))
+        self.assertIn('for p2, v2 in it2:', compiled.source)
+        self.assertIn("v2.get('res_name')", compiled.source)
+
+    def test_transform_same_as_transform(self):
+        configs = [{'count': 'elements',
+                    'entries.*.res_name': 'items.{1}.name',
+                    'entries.*.authors.*.id': 'items.{1}.authors.{3}.ref'},
+                   {'entries.*.authors.*': (transform_item, 'creators.{1}.{3}')},
+                   {'entries.#-1.res_name': None, 'meta.*': '{-1}.{0}.{5}'},
+                   {'entries.*.res_name': 'a{1}.{1}'},
+                   {'count': (lambda item, path: (('a.b', '#0'), item),)},
+                   {}]
+        for config in configs:
+            plan = compile_transform(config, backend='codegen')
+            self.assertEqual(plan(self.data), transform(self.data, config))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            compile_transform({}, backend='other')
@@ -0,0 +1,66 @@
+import unittest
+from flatql import Collection
+from flatql.paths import paths_overlap
+
+
+class TestCollection(unittest.TestCase):
+    def setUp(self):
+        self.docs = [{'customer': {'id': 1}, 'tags': ['a', 'b']},
+                     {'customer': {'id': 2}, 'tags': ['b'], 'meta': [1, 2]},
+                     {'customer': {'id': 1}, 'tags': [['nested']]}]
+        self.collection = Collection(self.docs, indexes=['customer.id', 'tags.*'])
+
+    def test_lookup(self):
+        self.assertEqual(self.collection.lookup('customer.id', 1), [self.docs[0], self.docs[2]])
+        self.assertEqual(self.collection.lookup('tags.*', 'b'), [self.docs[0], self.docs[1]])
+        self.assertEqual(self.collection.lookup('tags.*', ['nested']), [self.docs[2]])
+        self.assertEqual(self.collection.lookup('meta.#0', 1), [self.docs[1]])
+        self.assertEqual(self.collection.lookup('customer.id', 3), [])
+
+    def test_filter(self):
+        self.assertEqual(self.collection.filter('customer.id', lambda v: v > 1), [self.docs[1]])
+        self.assertEqual(self.collection.filter('tags.*', lambda v: isinstance(v, list)),
+                         [self.docs[2]])
+        self.assertEqual(self.collection.filter('meta.*', lambda v: v == 2), [self.docs[1]])
+
+    def test_index_updates(self):
+        collection = self.collection
+        collection.set_in(0, 'customer.id', 5)
+        self.assertEqual(collection.lookup('customer.id', 1), [self.docs[2]])
+        self.assertEqual(collection.lookup('customer.id', 5), [self.docs[0]])
+        collection.set_in_many(1, {'tags.#1': 'c', 'customer.id': 1})
+        self.assertEqual(collection.lookup('tags.*', 'c'), [self.docs[1]])
+        self.assertEqual(collection.lookup('customer.id', 1), [self.docs[1], self.docs[2]])
+        collection.update_in(2, 'customer.id', lambda v: v + 10)
+        self.assertEqual(collection.lookup('customer.id', 11), [self.docs[2]])
+        collection.remove(1)
+        self.assertEqual(collection.lookup('tags.*', 'b'), [self.docs[0]])
+        doc_id = collection.add({'customer': {'id': 5}})
+        self.assertEqual(doc_id, 3)
+        self.assertEqual(len(collection.lookup('customer.id', 5)), 2)
+        self.docs[0]['customer']['id'] = 7
+        collection.reindex(0)
+        self.assertEqual(collection.lookup('customer.id', 7), [self.docs[0]])
+
+    def test_replaced_containers(self):
+        # set_in replaces falsy containers, paths through them match other elements
+        collection = Collection([{'tags': []}, {}], indexes=['tags.#0', 'customer.id'])
+        collection.set_in(0, 'tags.name', 'x')
+        self.assertEqual(collection.lookup('tags.#0', None), [{'tags': {'name': 'x'}}])
+        collection.set_in(1, 'customer.name', 'A')
+        self.assertEqual(collection.lookup('customer.id', None), [{'customer': {'name': 'A'}}])
+
+    def test_index_updates_after_error(self):
+        collection = self.collection
+        with self.assertRaises(ValueError):
+            collection.set_in_many(0, {'customer.id': 9, 'tags.name': 'x'})
+        self.assertEqual(self.docs[0]['customer'], {'id': 9})
+        self.assertEqual(collection.lookup('customer.id', 9), [self.docs[0]])
+
+    def test_paths_overlap(self):
+        self.assertTrue(paths_overlap('tags.*', 'tags.#1'))
+        self.assertTrue(paths_overlap('customer.id', 'customer'))
+        self.assertTrue(paths_overlap('items.#0.id', 'items.#-1'))
+        self.assertFalse(paths_overlap('customer.id', 'customer.name'))
+        self.assertFalse(paths_overlap('tags.*', 'meta'))
+        self.assertTrue(paths_overlap('tags.#0', 'tags.name'))
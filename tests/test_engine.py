@@ -0,0 +1,106 @@
+import unittest
+from flatql import iter_find, find
+from flatql.engine import (PathTrie, iter_matches, iter_path_matches, iter_rendered_matches, iter_values,
+                           render_path, resolve)
+from flatql.paths import Path, literal_path, parse_path
+
+
+class TestEngine(unittest.TestCase):
+    def test_iter_matches_order(self):
+        data = {'a': [{'b': 1, 'c': 2}, {'b': 3}], 'd': {'b': 4}}
+        result = list(iter_matches(data, parse_path(['*', '*', 'b'])))
+        expected = [(('a', '#0', 'b'), 1), (('a', '#1', 'b'), 3)]
+        self.assertEqual(result, expected)
+        self.assertEqual(list(iter_values(data, parse_path(['*', '*', 'b']))), [1, 3])
+
+    def test_iter_matches_missing_key(self):
+        self.assertEqual(list(iter_matches({'a': {}}, parse_path(['a', 'b']))), [(('a', 'b'), None)])
+        self.assertEqual(list(iter_matches({'a': {}}, parse_path(['a', 'b', 'c']))), [])
+        self.assertEqual(list(iter_matches([1], parse_path(['#1']))), [])
+        self.assertEqual(list(iter_matches([1, 2], parse_path(['#-1']))), [(('#-1',), 2)])
+
+    def test_deep_path(self):
+        data = value = {}
+        for _ in range(2000):
+            value['a'] = {}
+            value = value['a']
+        value['a'] = 'deep'
+        path = ['a'] * 2001
+        self.assertEqual(list(iter_values(data, parse_path(path))), ['deep'])
+
+    def test_long_list(self):
+        data = list(range(70000))
+        result = list(iter_matches(data, parse_path(['*'])))
+        self.assertEqual(result[69999], (('#69999',), 69999))
+
+    def test_iter_find(self):
+        data = {'items': [{'name': 'Item 1'}, {'name': 'Item 2'}]}
+        found = iter_find(data, ['items', '*', 'name'])
+        self.assertEqual(next(found), ('items.#0.name', 'Item 1'))
+        self.assertEqual(list(found), [('items.#1.name', 'Item 2')])
+        self.assertEqual(find(data, ['items', '#0'], 'root'), [('root.items.#0', {'name': 'Item 1'})])
+        self.assertEqual(find(data, []), [(None, data)])
+        # path parts of other types are dict keys
+        self.assertEqual(find({1: {'a': 2}}, [1, 'a']), [('1.a', 2)])
+
+    def test_find_compact(self):
+        data = {'items': [{'name': 'Item 1', 'id': 1}, {'name': 'Item 2'}]}
+        result = find(data, 'items.*.*', 'root', compact=True)
+        self.assertEqual(result, find(data, 'items.*.*', 'root'))
+        self.assertIsInstance(result[0][0], Path)
+        self.assertIs(result[0][0].parent, result[1][0].parent)
+        self.assertEqual(find(data, [], compact=True), [(None, data)])
+        self.assertEqual(str(next(iter_find(data, 'items.#1', compact=True))[0]), 'items.#1')
+
+    def test_find_literal(self):
+        data = {'a': [{'b': 1}], 'c': {'#01': 2}}
+        self.assertEqual(find(data, 'a.#0.b'), [('a.#0.b', 1)])
+        self.assertEqual(find(data, 'a.#0.x', 'root'), [('root.a.#0.x', None)])
+        self.assertEqual(find(data, 'a.#1.b'), [])
+        self.assertEqual(find(data, 'a.#00.b'), [('a.#0.b', 1)])
+        self.assertEqual(find(data, 'c.#01'), [('c.#01', 2)])
+
+    def test_resolve(self):
+        data = {'a': [{'b': 1}]}
+        self.assertEqual(resolve(data, literal_path('a.#-1.b')), 1)
+        self.assertEqual(resolve(data, literal_path('a.#1.b'), 'missing'), 'missing')
+        self.assertEqual(resolve(data, literal_path('a.x'), 'missing'), 'missing')
+        self.assertIsNone(resolve(data, literal_path('a.#0.x'), 'missing'))
+        self.assertIs(resolve(data, ()), data)
+        self.assertIsNone(literal_path('a.*'))
+
+    def test_render_path(self):
+        self.assertEqual(render_path(('a', '#0')), 'a.#0')
+        self.assertEqual(render_path((1, 'b'), 'root'), 'root.1.b')
+
+    def test_iter_path_matches(self):
+        data = {'a': [{'b': 1, 'c': 2}]}
+        result = list(iter_path_matches(data, parse_path('a.*.*'), parent=Path(None, 'root')))
+        self.assertEqual(result, [('root.a.#0.b', 1), ('root.a.#0.c', 2)])
+        self.assertIs(result[0][0].parent, result[1][0].parent)
+        self.assertEqual(result[0][0].parts(), ('root', 'a', '#0', 'b'))
+
+    def test_iter_rendered_matches(self):
+        data = {'a': [{'b': 1, 'c': 2}, {1: 3}], 'd': {'e': 4}}
+        self.assertEqual(list(iter_rendered_matches(data, parse_path('a.*.*'), 'root')),
+                         [('root.a.#0.b', 1), ('root.a.#0.c', 2), ('root.a.#1.1', 3)])
+        self.assertEqual(list(iter_rendered_matches(data, parse_path('d.e'))), [('d.e', 4)])
+        self.assertEqual(list(iter_rendered_matches(data, parse_path('x.*'))), [])
+        self.assertEqual(list(iter_rendered_matches(data, ())), [(None, data)])
+
+    def test_path_trie(self):
+        data = {'order': {'items': [{'sku': 'A', 'qty': 1}, {'sku': 'B', 'qty': 2}],
+                          'id': 7}}
+        paths = ['order.items.*.qty', 'order.id', 'order.items.*.sku', 'order.items.#0.sku',
+                 'order.items', 'order.id']
+        trie = PathTrie([parse_path(path) for path in paths])
+        result = trie.find(data)
+        for path, found in zip(paths, result):
+            self.assertEqual(found, list(iter_matches(data, parse_path(path))))
+        result = trie.find(data, compact=True)
+        for path, found in zip(paths, result):
+            self.assertEqual([(match.parts(), value) for match, value in found],
+                             list(iter_matches(data, parse_path(path))))
+        self.assertIs(result[0][0][0].parent, result[2][0][0].parent)
+        self.assertEqual(trie.values(data)[2], ['A', 'B'])
+        self.assertEqual(PathTrie([parse_path([])]).values(data), [[data]])
@@ -0,0 +1,48 @@
+import unittest
+from array import array
+from flatql import flatten, unflatten, to_columns, from_columns
+from flatql import flat
+
+
+class TestFlat(unittest.TestCase):
+    docs = [{'id': 1, 'price': 1.5, 'items': [{'name': 'A'}, {'name': 'B'}], 'tags': []},
+            {'id': 2, 'price': 2, 'items': [{'name': 'C'}], 'meta': {}}]
+
+    def test_flatten(self):
+        expected = [('id', 1), ('price', 1.5), ('items.#0.name', 'A'),
+                    ('items.#1.name', 'B'), ('tags', [])]
+        self.assertEqual(flatten(self.docs[0]), expected)
+        self.assertEqual(flatten([1, {2: 'x'}]), [('#0', 1), ('#1.2', 'x')])
+        self.assertEqual(flatten({}), [])
+
+    def test_unflatten(self):
+        for doc in self.docs:
+            self.assertEqual(unflatten(flatten(doc)), doc)
+        # documents which can't be restored
+        for doc in ({}, [], 1):
+            self.assertIsNone(unflatten(flatten(doc)))
+        self.assertEqual(unflatten(flatten({'a.b': 1})), {'a': {'b': 1}})
+
+    def test_to_columns(self):
+        columns = to_columns(self.docs)
+        self.assertEqual(columns['id'], array('q', [1, 2]))
+        self.assertEqual(columns['price'], array('d', [1.5, 2.0]))
+        self.assertEqual(columns['items.#0.name'], ['A', 'C'])
+        self.assertEqual(columns['items.#1.name'], ['B', None])
+        self.assertEqual(columns['meta'], [None, {}])
+        self.assertEqual(to_columns(self.docs, numeric=None)['id'], [1, 2])
+        self.assertEqual(to_columns([{'a': True}, {'a': 1}])['a'], [True, 1])
+
+    def test_to_columns_same_path_twice(self):
+        self.assertEqual(flatten({'a.b': 1, 'a': {'b': 2}}), [('a.b', 1), ('a.b', 2)])
+        with self.assertRaises(ValueError):
+            to_columns([{'x': 1}, {'a.b': 1, 'a': {'b': 2}}])
+
+    def test_from_columns(self):
+        self.assertEqual(from_columns(to_columns(self.docs)), self.docs)
+
+    @unittest.skipIf(flat.numpy is None, 'numpy is not installed')
+    def test_to_columns_numpy(self):
+        columns = to_columns(self.docs, numeric='numpy')
+        self.assertEqual(columns['id'].dtype, flat.numpy.int64)
+        self.assertEqual(columns['price'].tolist(), [1.5, 2.0])
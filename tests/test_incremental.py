@@ -0,0 +1,69 @@
+import copy
+import unittest
+from flatql import IncrementalTransform, diff_paths, set_in, transform
+
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def upper(value, path):
+            self.calls.append(path)
+            return path.replace('name', 'title'), value.upper()
+
+        self.config = {'id': 'uuid',
+                       'items.*.name': (upper,),
+                       'items.*.qty': 'lines.{1}.quantity',
+                       'meta': None}
+        self.data = {'id': 1, 'items': [{'name': 'a', 'qty': 1}, {'name': 'b', 'qty': 2}],
+                     'meta': {'source': 'x'}}
+
+    def test_diff_paths(self):
+        new = copy.deepcopy(self.data)
+        new['items'][1]['qty'] = 3
+        new['meta']['version'] = 2
+        del new['id']
+        self.assertEqual(sorted(diff_paths(self.data, new)),
+                         ['id', 'items.#1.qty', 'meta.version'])
+        new['items'].append({})
+        self.assertEqual(sorted(diff_paths(self.data, new)), ['id', 'items', 'meta.version'])
+        self.assertEqual(diff_paths(self.data, copy.deepcopy(self.data)), [])
+        self.assertEqual(diff_paths(self.data, [1]), ['*'])
+        self.assertEqual(diff_paths(['x'], ['x', 1]), ['*'])
+        self.assertEqual(diff_paths([1, 2], [1]), ['*'])
+        self.assertEqual(diff_paths([1, 2], [1, 3]), ['#1'])
+        incremental = IncrementalTransform({'*': None})
+        incremental([1])
+        self.assertEqual(incremental.update([1, 2], diff_paths([1], [1, 2])), [1, 2])
+
+    def test_patch_in_place(self):
+        incremental = IncrementalTransform(self.config)
+        result = incremental(self.data)
+        self.assertEqual(result, transform(self.data, self.config))
+        self.calls.clear()
+        new = set_in(copy.deepcopy(self.data), 'items.#1.qty', 5)
+        updated = incremental.update(new, diff_paths(self.data, new))
+        self.assertEqual(self.calls, [])
+        self.assertIs(updated, result)
+        self.assertEqual(updated, transform(new, self.config))
+
+    def test_rebuild(self):
+        incremental = IncrementalTransform(self.config)
+        incremental(self.data)
+        new = copy.deepcopy(self.data)
+        new['items'].append({'name': 'c', 'qty': 3})
+        new['meta'] = {'source': 'y', 'items': [1]}
+        self.calls.clear()
+        result = incremental.update(new, diff_paths(self.data, new))
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(result, transform(new, self.config))
+        self.assertEqual(incremental.update(new, ['*']), transform(new, self.config))
+
+    def test_sparse_and_shared_targets(self):
+        config = {'a.*': 'out.{1}', 'b': 'out.a', 'c.#2': 'list.#2'}
+        data = {'a': {'a': 1, 'b': 2}, 'b': 3, 'c': [0, 1, 2]}
+        incremental = IncrementalTransform(config)
+        incremental(data)
+        for path, value in (('b', 4), ('c.#2', 5), ('a.a', 6), ('a.b', 7)):
+            data = set_in(data, path, value)
+            self.assertEqual(incremental.update(data, [path]), transform(data, config))
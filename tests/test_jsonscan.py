@@ -0,0 +1,79 @@
+import io
+import json
+import mmap
+import tempfile
+import unittest
+from unittest import mock
+from flatql import find_in_json, find_in_paths
+from flatql import jsonscan
+from flatql.jsonscan import POSSESSIVE, _skip_pattern
+
+
+class TestJsonScan(unittest.TestCase):
+    document = {'meta': {'id': 7, 'tags': ['a', 'b']},
+                'items': [{'name': 'Item "1"', 'qty': 1, 'nested': {'x': [1, {'y': 2}]}},
+                          {'name': 'Item {2}', 'qty': 2.5, 'esc\\aped': None}],
+                'empty': {},
+                'list': [],
+                'text': 'brackets ]}[{ in "strings"'}
+    paths = [['meta.id'], ['meta.missing', 'meta.tags.#1', 'meta.tags.#5'],
+             ['items.*.name', 'items.#-1.qty', 'items.#0.nested.x.#1.y'],
+             ['items.#1.esc\\aped', 'items.#1.missing', 'items.#1.nested.x'],
+             ['meta', 'meta.tags.*'], ['*.id', 'text', 'list.#0', 'empty.*'],
+             ['items.#0.nested.*.#-1', 'items.#0', 'items.#0.qty']]
+
+    def test_same_as_find_in_paths(self):
+        for indent in (None, 2):
+            data = json.dumps(self.document, indent=indent).encode()
+            for paths in self.paths:
+                self.assertEqual(find_in_json(data, paths), find_in_paths(self.document, paths),
+                                 paths)
+
+    def test_sources(self):
+        data = json.dumps(self.document, ensure_ascii=False).encode()
+        expected = find_in_paths(self.document, ['items.*.name'])
+        self.assertEqual(find_in_json(io.BytesIO(data), ['items.*.name']), expected)
+        self.assertEqual(find_in_json(bytearray(data), ['items.*.name']), expected)
+        with tempfile.TemporaryFile() as file:
+            file.write(data)
+            file.flush()
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                self.assertEqual(find_in_json(mapped, ['items.*.name']), expected)
+                self.assertEqual(find_in_json(mapped, ['meta.id']), [7])
+        # values decoded as a whole after the start of the file, ASCII and UTF-8
+        for data in (b'{"x": "\\u00e9", "a": [1, {"b": 2}]}', '{"x": "é", "a": [1, {"b": 2}]}'.encode()):
+            with tempfile.TemporaryFile() as file:
+                file.write(data)
+                file.flush()
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    self.assertEqual(find_in_json(mapped, ['a.*', 'x']), [1, {'b': 2}, 'é'])
+
+    def test_small_windows(self):
+        # values decoded as a whole are cut by windows, numbers too
+        document = dict(self.document, numbers=[123456789, 1.5e10, [12345]])
+        data = json.dumps(document).encode()
+        paths = ['items.*.name', 'numbers.*', 'numbers.#-1', 'items.#-1', 'meta.tags.*']
+        for size in (1, 3, 7):
+            with mock.patch.object(jsonscan, 'WINDOW_SIZE', size), \
+                    mock.patch.object(jsonscan, 'WINDOW_GROWTH', 2):
+                self.assertEqual(find_in_json(data, paths), find_in_paths(document, paths))
+                with self.assertRaises(ValueError):
+                    find_in_json(b'{"a": [1, 2', ['a.*'])
+
+    def test_invalid_json(self):
+        for data in (b'', b'{"a": 1', b'{"a" 1}', b'{"a": [1 2]}', b'{"a": "b'):
+            with self.assertRaises(ValueError):
+                find_in_json(data, ['a.#1'])
+
+    def test_duplicate_keys(self):
+        # unlike json.loads, the first value of a key is used
+        self.assertEqual(find_in_json(b'{"a": 1, "a": 2, "b": 3}', ['a', 'b']), [1, 3])
+        self.assertEqual(find_in_json(b'{"a": {"b": 1}, "a": {"b": 2}}', ['a.b']), [1])
+
+    def test_skip_pattern(self):
+        data = b'1, [2, {"a": "]", "b": [[]]}], "x\\"]" ] tail'
+        end = data.index(b'] tail')
+        for possessive in ((True, False) if POSSESSIVE else (False,)):
+            self.assertEqual(_skip_pattern(4, possessive).match(data).end(), end)
+            # containers nested deeper than the pattern stop the match at their start
+            self.assertEqual(_skip_pattern(1, possessive).match(data).end(), data.index(b'['))
@@ -0,0 +1,31 @@
+import unittest
+from flatql import transform_many, transform, rewrite_path
+
+
+def transform_item(item, path, template):
+    return (rewrite_path(path, template), item * 10)
+
+
+class TestParallel(unittest.TestCase):
+    config = {'id': 'uuid', 'items.*.value': (transform_item, 'values.{1}')}
+    docs = [{'id': i, 'items': [{'value': i}, {'value': i + 1}]} for i in range(50)]
+
+    def test_transform_many_ordered(self):
+        result = list(transform_many(self.docs, self.config, workers=2, chunksize=7))
+        self.assertEqual(result, [transform(doc, self.config) for doc in self.docs])
+
+    def test_transform_many_unordered(self):
+        result = list(transform_many(iter(self.docs), self.config, workers=2, chunksize=3,
+                                     ordered=False))
+        expected = [transform(doc, self.config) for doc in self.docs]
+        self.assertEqual(sorted(result, key=lambda r: r['uuid']), expected)
+
+    def test_transform_many_in_process(self):
+        config = {'id': (lambda item, path: ('uuid', item),)}
+        self.assertEqual(list(transform_many(self.docs[:2], config, workers=1)),
+                         [{'uuid': 0}, {'uuid': 1}])
+
+    def test_transform_many_not_picklable(self):
+        config = {'id': (lambda item, path: ('uuid', item),)}
+        with self.assertRaises(ValueError):
+            transform_many(self.docs, config, workers=2)
@@ -0,0 +1,61 @@
+import unittest
+from flatql import find, get_in, parse_template
+from flatql.paths import (INDEX, KEY, WILDCARD, Path, Segment, parse_path, path_from_parts, clear_path_cache,
+                          path_cache_info, set_path_cache_size, DEFAULT_CACHE_SIZE)
+
+
+class TestPaths(unittest.TestCase):
+    def tearDown(self):
+        set_path_cache_size(DEFAULT_CACHE_SIZE)
+
+    def test_parse_path(self):
+        segments = parse_path('items.*.#-1.#x')
+        self.assertEqual([s.kind for s in segments], [KEY, WILDCARD, INDEX, KEY])
+        self.assertEqual(segments[2].index, -1)
+        self.assertEqual(segments[2].name, '#-1')
+        self.assertEqual(parse_path('#01')[0].name, '#1')
+        self.assertEqual(parse_path(['a', 'b']), parse_path('a.b'))
+        self.assertIs(parse_path(segments), segments)
+        self.assertEqual(parse_path('a')[0], Segment(KEY, 'a'))
+
+    def test_path(self):
+        prefix = path_from_parts(['items', '#0'])
+        first = Path(prefix, 'name')
+        second = Path(prefix, 'id')
+        self.assertIs(first.parent, second.parent)
+        self.assertEqual(str(first), 'items.#0.name')
+        self.assertEqual(first.parts(), ('items', '#0', 'name'))
+        self.assertEqual(len(first), 3)
+        self.assertEqual((first[-1], first[-2], first[0]), ('name', '#0', 'items'))
+        self.assertEqual(first, 'items.#0.name')
+        self.assertEqual(first, path_from_parts(['items', '#0', 'name']))
+        self.assertNotEqual(first, second)
+        self.assertEqual({'items.#0.name': 1}[first], 1)
+        self.assertEqual(str(path_from_parts([1, 'b'])), '1.b')
+        self.assertIsNone(path_from_parts([]))
+        with self.assertRaises(IndexError):
+            first[-4]
+
+    def test_cache_statistics(self):
+        clear_path_cache()
+        parse_path('a.b.c')
+        parse_path('a.b.c')
+        get_in({'a': {'b': {'c': 1}}}, 'a.b.c')
+        info = path_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 1, 1))
+        for _ in range(100):
+            get_in({'a': {'b': {'c': 1}}}, 'a.b.c')
+            find({'x': 1}, 'x')
+        parse_template('b.{1}')
+        info = path_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (201, 3, 3))
+
+    def test_cache_size(self):
+        set_path_cache_size(2)
+        for path in ('a', 'b', 'c'):
+            parse_path(path)
+        self.assertEqual(path_cache_info().currsize, 2)
+        self.assertEqual(path_cache_info().maxsize, 2)
+        for template in ('a.{1}', 'b.{1}', 'c.{1}'):
+            parse_template(template)
+        self.assertEqual(path_cache_info().currsize, 4)
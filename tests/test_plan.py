@@ -0,0 +1,80 @@
+import unittest
+from flatql import compile_transform, transform, rewrite_path
+from flatql.plan import cached_plan, clear_plan_cache
+from flatql.paths import Path, compile_template, literal_path, parse_template, path_from_parts
+
+
+class TestPlan(unittest.TestCase):
+    def test_compile_template(self):
+        self.assertEqual(compile_template('items.{1}.name', 3), ('items', 1, 'name'))
+        self.assertEqual(compile_template('{3}.{-1}', 2), ('{3}', 1))
+        self.assertEqual(compile_template('id', 1), ('id',))
+        self.assertIsNone(compile_template('a{1}.{1}', 2))
+        self.assertIsNone(compile_template('{x}', 2))
+
+    def test_template(self):
+        template = parse_template('lines.{1}.{-1}')
+        self.assertIs(parse_template('lines.{1}.{-1}'), template)
+        self.assertEqual(template.render(('items', '#0', 'sku')), ['lines', '#0', 'sku'])
+        self.assertEqual(template.render(path_from_parts(['items', '#1', 'id'])), ['lines', '#1', 'id'])
+        self.assertEqual(template.render_many([('a', '#0', 'b'), ('a', '#1'), Path(None, 'a')]),
+                         [['lines', '#0', 'b'], ['lines', '#1', '#1'], ['lines', '{1}', 'a']])
+        self.assertEqual(template('items.#2.sku'), 'lines.#2.sku')
+        self.assertEqual(parse_template('x{1}.{1}').render(('a', 'b')), ['xb', '{1}'])
+        with self.assertRaises(IndexError):
+            parse_template('{-3}').render(('a', 'b'))
+
+    def test_plan_reuse(self):
+        plan = compile_transform({'list.*.id': 'items.{1}.uuid', 'name': 'title'})
+        self.assertEqual(plan({'name': 'A', 'list': [{'id': 1}]}),
+                         {'title': 'A', 'items': [{'uuid': 1}]})
+        self.assertEqual(plan.apply({'name': 'B', 'list': [{'id': 2}, {'id': 3}]}),
+                         {'title': 'B', 'items': [{'uuid': 2}, {'uuid': 3}]})
+
+    def test_plan_same_as_transform(self):
+        def transform_item(item, path, template):
+            return (rewrite_path(path, template), {'test': item['id']})
+
+        resource = {'count': 2,
+                    'a': {'aa': 'aaa'},
+                    'entries': [
+                        {'res_name': 'A', 'authors': [{'id': 1}, {'id': 2}]},
+                        {'res_name': 'B', 'authors': [{'id': 4}, {'id': 1}]}]}
+        configs = [{'count': 'elements',
+                    'entries.*.res_name': 'items.{1}.name',
+                    'entries.*.authors.*.id': 'items.{1}.authors.{3}.ref'},
+                   {'entries.*.authors.*': (transform_item, 'creators.{1}.{3}')},
+                   {'entries.#-1.res_name': None, 'a.*': '{-1}.{0}.{5}'},
+                   {'entries.*.res_name': '{1}.name'}]
+        for config in configs:
+            self.assertEqual(compile_transform(config)(resource),
+                             transform(resource, config))
+
+    def test_cached_plan(self):
+        clear_plan_cache()
+        config = {'list.*.id': 'items.{1}', 'name': 'title'}
+        plan = cached_plan(config)
+        self.assertIs(cached_plan(dict(config)), plan)
+        self.assertIsNot(cached_plan({'name': 'title', 'list.*.id': 'items.{1}'}), plan)
+        # configs with unhashable values are compiled every time
+        config = {'list.*': (lambda item, path, keys: (path, [item[key] for key in keys]), ['id'])}
+        self.assertIsNot(cached_plan(config), cached_plan(config))
+        self.assertEqual(transform({'list': [{'id': 1}]}, config), {'list': [[1]]})
+
+    def test_literal_rules(self):
+        plan = compile_transform({'a.b': 'x', 'l.#0': 'first', 'l.#01': 'y', 'a.c': 'z', 'm.n': 'w'})
+        self.assertEqual(plan.matchers[0], (literal_path('a.b'), ('a', 'b')))
+        self.assertEqual(plan.matchers[2], 0)
+        data = {'a': {'b': 1}, 'l': [2, 3]}
+        self.assertEqual(plan(data), {'x': 1, 'first': 2, 'y': 3, 'z': None})
+
+    def test_compact_plan(self):
+        resource = {'a': {'b': {'c': {'items': [{'id': 1, 'tags': ['x']}, {'id': 2, 'tags': []}]}}}}
+        config = {'a.b.c.items.*.id': 'ids.{4}', 'a.b.c.items.*.tags.*': 'tags.{-3}.{-1}',
+                  'a.b.c.items.*.tags': None, 'a.*.*.items.#0.id': (lambda value, path: (path, value),)}
+        plan = compile_transform(config)
+        self.assertTrue(plan.compact)
+        expected = {'ids': [1, 2], 'tags': [['x']],
+                    'a': {'b': {'c': {'items': [{'id': 1, 'tags': ['x']}, {'tags': []}]}}}}
+        self.assertEqual(plan(resource), expected)
+        self.assertEqual(plan(resource), compile_transform(config, backend='codegen')(resource))
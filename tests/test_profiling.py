@@ -0,0 +1,44 @@
+import unittest
+from flatql import compile_transform, find, find_in_paths, rewrite_path, transform
+from flatql.profiling import Hook, Profiler
+
+
+def transform_item(item, path, template):
+    return (rewrite_path(path, template), item)
+
+
+class TestProfiling(unittest.TestCase):
+    data = {'id': 1, 'items': [{'name': 'A'}, {'name': 'B'}, {'other': 'C'}]}
+    config = {'id': 'uuid', 'items.*.name': (transform_item, 'names.{1}')}
+
+    def test_transform_profiler(self):
+        profiler = Profiler()
+        result = transform(self.data, self.config, hook=profiler)
+        self.assertEqual(result, transform(self.data, self.config))
+        rule = profiler.rules['items.*.name']
+        self.assertEqual((rule.calls, rule.matches, rule.nodes, rule.callable_calls), (1, 3, 7, 3))
+        self.assertEqual(profiler.rules['id'].matches, 1)
+        self.assertEqual((profiler.build_calls, profiler.build_items), (1, 4))
+        self.assertIn('items.*.name', profiler.report())
+        profiler.reset()
+        self.assertEqual(profiler.rules, {})
+
+    def test_codegen_profiler(self):
+        profiler = Profiler()
+        plan = compile_transform(self.config, backend='codegen')
+        self.assertEqual(plan(self.data, hook=profiler), plan(self.data))
+        self.assertEqual(profiler.rules['items.*.name'].callable_calls, 3)
+
+    def test_find_hooks(self):
+        calls = []
+
+        class Recorder(Hook):
+            def on_find(self, path, elapsed, matches, nodes):
+                calls.append((path, matches, nodes))
+
+        hook = Recorder()
+        self.assertEqual(find(self.data, ['items', '*', 'name'], hook=hook),
+                         find(self.data, ['items', '*', 'name']))
+        self.assertEqual(find_in_paths(self.data, ['id', 'items.#0.name'], hook=hook),
+                         [1, 'A'])
+        self.assertEqual(calls, [('items.*.name', 3, 7), ('id', 1, 1), ('items.#0.name', 1, 3)])
@@ -0,0 +1,49 @@
+import unittest
+from flatql import query
+
+
+class TestQuery(unittest.TestCase):
+    data = {'items': [{'name': 'Item 1'}, {'name': 'Item 2'}, {'name': 'Item 3'}]}
+
+    def test_query_values(self):
+        q = query(self.data, 'items.*.name')
+        self.assertEqual(list(q), ['Item 1', 'Item 2', 'Item 3'])
+        self.assertEqual(q.first(), 'Item 1')
+        self.assertEqual(q.count(), 3)
+        with self.assertRaises(TypeError):
+            len(q)
+        self.assertTrue(q.exists())
+        self.assertEqual(q[1], 'Item 2')
+        self.assertEqual(q[-1], 'Item 3')
+        self.assertEqual(q[1:], ['Item 2', 'Item 3'])
+        self.assertEqual(q[::-1], ['Item 3', 'Item 2', 'Item 1'])
+        with self.assertRaises(IndexError):
+            q[3]
+
+    def test_query_paths(self):
+        q = query(self.data, 'items.#-1.name')
+        self.assertEqual(list(q.items()), [('items.#-1.name', 'Item 3')])
+        self.assertEqual(list(q.paths()), ['items.#-1.name'])
+
+    def test_query_empty(self):
+        q = query(self.data, 'other.*')
+        self.assertFalse(q)
+        self.assertEqual(q.first('default'), 'default')
+        self.assertEqual(q.count(), 0)
+
+    def test_query_short_circuit(self):
+        visited = []
+
+        class Tracking(dict):
+            def get(self, key, default=None):
+                visited.append(key)
+                return super().get(key, default)
+
+        data = {'items': [Tracking(name=idx) for idx in range(100)]}
+        self.assertEqual(query(data, 'items.*.name').first(), 0)
+        self.assertEqual(len(visited), 1)
+        # the document is walked once
+        for convert in (list, sorted, lambda q: q[-1], lambda q: q[::-1]):
+            visited.clear()
+            convert(query(data, 'items.*.name'))
+            self.assertEqual(len(visited), 100)
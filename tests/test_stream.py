@@ -0,0 +1,63 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from flatql import transform_stream
+from flatql.__main__ import main
+
+
+class TestStream(unittest.TestCase):
+    config = {'id': 'uuid', 'items.*.name': 'names.{1}'}
+
+    def test_transform_stream_from_lines(self):
+        source = io.StringIO('{"id": 1, "items": [{"name": "A"}]}\n'
+                             '\n'
+                             '{"id": 2, "items": []}\n')
+        result = list(transform_stream(source, self.config))
+        self.assertEqual(result, [{'uuid': 1, 'names': ['A']}, {'uuid': 2}])
+
+    def test_transform_stream_from_documents(self):
+        source = iter([{'id': 1}, {'id': 2}, {'id': 3}])
+        result = list(transform_stream(source, self.config, batch_size=2))
+        self.assertEqual(result, [[{'uuid': 1}, {'uuid': 2}], [{'uuid': 3}]])
+
+    def test_transform_stream_errors(self):
+        lines = [b'{"id": 1}', b'{broken', b'{"id": 3}']
+        with self.assertRaises(ValueError):
+            list(transform_stream(lines, self.config))
+        self.assertEqual(list(transform_stream(lines, self.config, errors='skip')),
+                         [{'uuid': 1}, {'uuid': 3}])
+        failures = []
+        result = list(transform_stream(lines, self.config, errors='collect', failures=failures))
+        self.assertEqual(result, [{'uuid': 1}, {'uuid': 3}])
+        self.assertEqual([(position, record) for position, record, _ in failures],
+                         [(2, b'{broken')])
+        with self.assertRaises(ValueError):
+            transform_stream(lines, self.config, errors='collect')
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config_path = os.path.join(directory, 'config.json')
+            input_path = os.path.join(directory, 'input.ndjson')
+            output_path = os.path.join(directory, 'output.ndjson')
+            with open(config_path, 'w') as f:
+                json.dump(self.config, f)
+            with open(input_path, 'w') as f:
+                f.write('{"id": 1}\n{"id": 2}\n')
+            self.assertEqual(main([config_path, input_path, '-o', output_path]), 0)
+            with open(output_path) as f:
+                self.assertEqual([json.loads(line) for line in f], [{'uuid': 1}, {'uuid': 2}])
+
+    def test_cli_invalid_config(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config_path = os.path.join(directory, 'config.json')
+            for config in ({'items.*': ['func', 'names.{1}']}, ['id']):
+                with open(config_path, 'w') as f:
+                    json.dump(config, f)
+                stderr = io.StringIO()
+                with redirect_stderr(stderr), self.assertRaises(SystemExit) as context:
+                    main([config_path, os.devnull])
+                self.assertEqual(context.exception.code, 2)
+                self.assertIn('config.json', stderr.getvalue())
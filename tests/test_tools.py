@@ -1,5 +1,5 @@
 import unittest
-from flatql import get_in, set_in, find_in_path, find_in_paths, transform, rewrite_path, extract
+from flatql import get_in, get_in_many, set_in, assoc_in, set_in_many, update_in, find_in_path, find_in_paths, transform, rewrite_path, extract
 
 
 class TestDocument(unittest.TestCase):
@@ -20,6 +20,24 @@ class TestDocument(unittest.TestCase):
         self.assertEqual(get_in({}, 'a.b.c.d'), None)
         self.assertEqual(get_in({}, 'a.#0'), None)
 
+    def test_get_in_default(self):
+        data = {'a': {'b': None}, 'l': [{'#0': 1}]}
+        self.assertEqual(get_in(data, 'a.c', 'default'), None)
+        self.assertEqual(get_in(data, 'x.c', 'default'), 'default')
+        self.assertEqual(get_in(data, 'l.#0.#0', 'default'), 1)
+        self.assertEqual(get_in(data, 'l.name', 'default'), 'default')
+        self.assertEqual(get_in(data, ['l', '#00', '#0']), 1)
+        with self.assertRaises(ValueError):
+            get_in(data, 'l.*')
+
+    def test_get_in_many(self):
+        data = {'a': {'b': 1}, 'l': [1, 2]}
+        self.assertEqual(get_in_many(data, ['a.b', 'l.#-1', 'a.c', 'x.y', 'l.#2'], 0),
+                         [1, 2, None, 0, 0])
+        self.assertEqual(get_in_many(data, []), [])
+        with self.assertRaises(ValueError):
+            get_in_many(data, ['a.b', 'l.*'])
+
     def test_set_in_with_dict(self):
         data = {'a': {'b': 'c'}}
         expected = {'a': {'b': 'item'}}
@@ -48,6 +66,55 @@ class TestDocument(unittest.TestCase):
         result = set_in(result, 'c.#1', 'Item 2')
         self.assertEqual(result, expected)
 
+    def test_assoc_in(self):
+        data = {'a': {'b': 'c'}, 'items': [{'name': 'Item 1'}, {'name': 'Item 2'}]}
+        result = assoc_in(data, 'items.#1.name', 'Item 3')
+        self.assertEqual(result, {'a': {'b': 'c'}, 'items': [{'name': 'Item 1'}, {'name': 'Item 3'}]})
+        self.assertEqual(data, {'a': {'b': 'c'}, 'items': [{'name': 'Item 1'}, {'name': 'Item 2'}]})
+        # untouched subtrees are shared, containers on the path are copied
+        self.assertIs(result['a'], data['a'])
+        self.assertIs(result['items'][0], data['items'][0])
+        self.assertIsNot(result['items'], data['items'])
+        self.assertIsNot(result['items'][1], data['items'][1])
+        self.assertEqual(assoc_in({}, 'b.#0.name', 'Item 1'), set_in({}, 'b.#0.name', 'Item 1'))
+        self.assertEqual(assoc_in({'c': [1, 2]}, 'c.#-1', 3), {'c': [1, 3]})
+        self.assertEqual(assoc_in({'c': [1]}, 'c.#5', 2), {'c': [1, 2]})
+        with self.assertRaises(ValueError):
+            assoc_in({}, 'a.*', 1)
+        with self.assertRaises(ValueError):
+            assoc_in({'a': [1]}, 'a.b', 1)
+
+    def test_set_in_many(self):
+        data = {'a': {'b': 'c'}, 'c': ['Item 0']}
+        expected = {'a': {'b': 'x', 'd': 'y'},
+                    'b': [{'name': 'Item 1', 'id': 1}, {'name': 'Item 2'}],
+                    'c': ['Item 1', 'Item 2']}
+        result = set_in_many(data, {'a.b': 'x',
+                                    'a.d': 'y',
+                                    'b.#0.name': 'Item 1',
+                                    'b.#5.name': 'Item 2',
+                                    'b.#0.id': 1,
+                                    'c.#0': 'Item 1',
+                                    'c.#1': 'Item 2'})
+        self.assertEqual(result, expected)
+        self.assertEqual(set_in_many({}, {'#0.a': 1, '#1': 2}), [{'a': 1}, 2])
+        self.assertEqual(set_in_many({'a': [1, 2]}, {'a.#-1': 3}), {'a': [1, 3]})
+        self.assertEqual(set_in_many({}, {'a.#1': 'x', 'a.#0': 'y'}), {'a': ['y', 'x']})
+        self.assertEqual(set_in_many({'a': [0]}, {'a.#7.b': 1, 'a.#3': 2, 'a.#7.c': 3}),
+                         {'a': [0, 2, {'b': 1, 'c': 3}]})
+        # falsy items are replaced, set_in inserts before them
+        self.assertEqual(set_in_many({'c': [None, 1]}, {'c.#0': 'V'}), {'c': ['V', 1]})
+        self.assertEqual(set_in({'c': [None, 1]}, 'c.#0', 'V'), {'c': ['V', None, 1]})
+        self.assertEqual(set_in_many({'a': {'b': 1}}, {'a.c': 2, 'a': 3}), {'a': 3})
+        with self.assertRaises(ValueError):
+            set_in_many({}, {'a.*': 1})
+
+    def test_update_in(self):
+        data = {'items': [{'count': 1}]}
+        self.assertEqual(update_in(data, 'items.#0.count', lambda v: v + 1),
+                         {'items': [{'count': 2}]})
+        self.assertEqual(update_in({}, 'a.#0', lambda v, d: (v or 0) + d, 5), {'a': [5]})
+
     def test_find_in_path(self):
         data = {'res_uuid': '00000000-0000-0000-0000-000000000001',
                 'test': {'id': '00000000-0000-0000-0000-000000000002'},
@@ -209,6 +276,16 @@ class TestDocument(unittest.TestCase):
         expected = {'creator': [{'test': 1}, {'test': 1}]}
         self.assertEqual(result, expected)
 
+    def test_transform_dotted_keys(self):
+        resource = {'a.b': 1}
+        self.assertEqual(transform(resource, {'*': None}), {'a.b': 1})
+        self.assertEqual(transform(resource, {'*': 'x.{0}'}), {'x': {'a.b': 1}})
+        # function rules split paths returned as strings, tuples are used as they are
+        self.assertEqual(transform(resource, {'*': (lambda item, path: (path, item),)}),
+                         {'a': {'b': 1}})
+        self.assertEqual(transform(resource, {'*': (lambda item, path: ((path,), item),)}),
+                         {'a.b': 1})
+
     def test_transform_with_deep_lists(self):
         resource = {'list': [{'id': 1}, {'id': 2}],
                     'deep_list': [{'name': 'Item 1',
@@ -243,6 +320,16 @@ class TestDocument(unittest.TestCase):
         self.assertEqual('items.item_1.uuid', rewrite_path('items.item_1.id', 'items.{1}.uuid'))
         self.assertEqual('d.c.b.a', rewrite_path('a.b.c.d', '{3}.{2}.{1}.{0}'))
 
+    def test_rewrite_path_special_templates(self):
+        self.assertEqual('b.{5}', rewrite_path('a.b', '{1}.{5}'))
+        self.assertEqual('b.b', rewrite_path('a.b', '{-1}.{ 1 }'))
+        self.assertEqual('xb.{1}', rewrite_path('a.b', 'x{1}.{1}'))
+        self.assertEqual('x.{0}', rewrite_path('x.{0}', '{1}.{0}'))
+        with self.assertRaises(IndexError):
+            rewrite_path('a.b', '{-3}')
+        with self.assertRaises(ValueError):
+            rewrite_path('a.b', '{x}')
+
     def test_transform_list_first_and_last_element(self):
         resource = [{'id': 1, 'name': 'First'},
                     {'id': 2, 'name': 'Second'},